@@ -2,7 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.services.customer_service import CustomerService
-from app.schemas.customer import CustomerProfile, CustomerSummary
+from app.schemas.customer import CustomerProfile, CustomerSummary, CustomerBundle
 from app.schemas.base import SuccessResponse, MessageResponse
 
 router = APIRouter()
@@ -46,6 +46,21 @@ async def get_customer_summary(
     return SuccessResponse(message="Customer summary retrieved successfully", data=summary)
 
 
+@router.get("/customers/{customer_id}/bundle", response_model=SuccessResponse[CustomerBundle])
+async def get_customer_bundle(
+    customer_id: str,
+    customer_service: CustomerService = Depends()
+):
+    """Get customer profile and summary in one response"""
+    bundle = customer_service.get_customer_bundle(customer_id)
+    if not bundle:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Customer {customer_id} not found"
+        )
+    return SuccessResponse(message="Customer bundle retrieved successfully", data=bundle)
+
+
 @router.get("/customers/{customer_id}/exists", response_model=SuccessResponse[dict])
 async def check_customer_exists(
     customer_id: str,
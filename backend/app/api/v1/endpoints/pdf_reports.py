@@ -1,12 +1,14 @@
 """
 PDF Report endpoints
 """
+import asyncio
 import os
 from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.responses import FileResponse
 
+from app.core.pdf_utils import save_pdf_to_file
 from app.db.database import MockDatabase, get_db
 from app.schemas.pdf_report import PDFReportRequest, PDFReportResponse
 from app.schemas.analysis import ConsolidationOffer
@@ -46,16 +48,15 @@ async def generate_pdf_report(
         )
         
         # Generate PDF report
-        pdf_bytes = pdf_service.generate_financial_report(analysis_result)
+        pdf_bytes = await pdf_service.agenerate_financial_report(analysis_result)
         
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"financial_report_{request.customer_id}_{timestamp}.pdf"
         
-        # Save to temporary file for file response
+        # Save to temporary file for file response, off the event loop
         temp_path = f"/tmp/{filename}"
-        with open(temp_path, 'wb') as f:
-            f.write(pdf_bytes)
+        await asyncio.to_thread(save_pdf_to_file, pdf_bytes, temp_path)
         
         return PDFReportResponse(
             customer_id=request.customer_id,
@@ -120,7 +121,7 @@ async def generate_and_download_report(
         )
         
         # Generate PDF report
-        pdf_bytes = pdf_service.generate_financial_report(analysis_result)
+        pdf_bytes = await pdf_service.agenerate_financial_report(analysis_result)
         
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
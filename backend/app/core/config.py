@@ -28,6 +28,20 @@ class Settings(BaseSettings):
     AZURE_INFERENCE_CREDENTIAL: str
     AZURE_INFERENCE_MODEL: str
 
+    # Maximum number of concurrent LLM calls issued by a single request
+    TOOL_CONCURRENCY_LIMIT: int = 5
+    # Maximum number of PDF reports generated concurrently by the async report path
+    REPORT_CONCURRENCY_LIMIT: int = 4
+    # Number of worker processes rendering PDFs; each one loads its own WeasyPrint
+    PDF_WORKER_PROCESSES: int = 2
+
+    # Convert report markdown to HTML with the LLM instead of locally
+    REPORT_HTML_WITH_LLM: bool = False
+
+    # PDF report cache
+    REPORT_CACHE_MAXSIZE: int = 256
+    REPORT_CACHE_TTL_SECONDS: int = 3600
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -2,19 +2,49 @@
 
 import re
 import logging
+import threading
 import markdown
 from typing import Optional
 
+# Patterns are compiled once at import; these helpers run on every LLM HTML response
+_FENCE_OPEN_RE = re.compile(r"^```[a-zA-Z0-9]*\s*")
+_FENCE_CLOSE_RE = re.compile(r"\s*```$")
+_BODY_RE = re.compile(r"<body[^>]*>(.*?)</body\s*>", re.IGNORECASE | re.DOTALL)
+_BODY_STRICT_RE = re.compile(r"<body[^>]*>(.*?)</body>", re.IGNORECASE | re.DOTALL)
+_DOCTYPE_RE = re.compile(r"<!DOCTYPE[^>]*>\s*", re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r"</?html[^>]*>", re.IGNORECASE)
+_HTML_OPEN_RE = re.compile(r"<html[^>]*>", re.IGNORECASE)
+_HTML_CLOSE_RE = re.compile(r"</html\s*>", re.IGNORECASE)
+_HEAD_RE = re.compile(r"<head[^>]*>.*?</head\s*>", re.IGNORECASE | re.DOTALL)
+_HEAD_CLOSE_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+_BODY_OPEN_RE = re.compile(r"<body[^>]*>", re.IGNORECASE)
+_BODY_CLOSE_RE = re.compile(r"</body\s*>", re.IGNORECASE)
+_FIRST_TAG_RE = re.compile(r"<[a-zA-Z!/?]")
+_ANY_TAG_RE = re.compile(r"</?[a-zA-Z]+[^>]*>")
+_TABLE_RE = re.compile(r"(?is)<table\b.*?</table\s*>")
+_TABLE_CLOSE_RE = re.compile(r"(?is)</table\s*>")
+_THEAD_RE = re.compile(r"<thead\b", re.IGNORECASE)
+_TBODY_RE = re.compile(r"<tbody\b", re.IGNORECASE)
+_ROW_RE = re.compile(r"(?is)<tr\b.*?</tr>")
+_SECTION_TAG_RE = re.compile(r"(?is)</?(thead|tbody)\b[^>]*>")
+
+# Markdown converters are not thread-safe, so each thread keeps its own
+_markdown_local = threading.local()
+
+
+def _strip_fence_markers(s: str) -> str:
+    """Remove a leading ```lang and trailing ``` from already-stripped text."""
+    if s.startswith("```"):
+        s = _FENCE_OPEN_RE.sub("", s, count=1)
+        s = _FENCE_CLOSE_RE.sub("", s, count=1)
+    return s.strip()
+
 
 def strip_code_fences(s: str) -> str:
     """Remove code fence markers from text."""
     if not s:
         return s
-    s = s.strip()
-    if s.startswith("```"):
-        s = re.sub(r"^```[a-zA-Z0-9]*\s*", "", s, count=1)
-        s = re.sub(r"\s*```$", "", s, count=1)
-    return s.strip()
+    return _strip_fence_markers(s.strip())
 
 
 def remove_html_wrappers(s: str) -> str:
@@ -23,22 +53,22 @@ def remove_html_wrappers(s: str) -> str:
         return s
 
     # Extract body if present
-    m = re.search(r"<body[^>]*>(.*?)</body\s*>", s, flags=re.IGNORECASE | re.DOTALL)
+    m = _BODY_RE.search(s)
     if m:
         return m.group(1).strip()
 
     # Remove doctype
-    s = re.sub(r"<!DOCTYPE[^>]*>\s*", "", s, flags=re.IGNORECASE)
+    s = _DOCTYPE_RE.sub("", s)
 
     # Strip <html> and </html>
-    s = re.sub(r"</?html[^>]*>", "", s, flags=re.IGNORECASE)
+    s = _HTML_TAG_RE.sub("", s)
 
     # Remove <head>...</head>
-    s = re.sub(r"<head[^>]*>.*?</head\s*>", "", s, flags=re.IGNORECASE | re.DOTALL)
+    s = _HEAD_RE.sub("", s)
 
     # If any <body ...> remains without closing tag (unlikely), strip it
-    s = re.sub(r"<body[^>]*>", "", s, flags=re.IGNORECASE)
-    s = re.sub(r"</body\s*>", "", s, flags=re.IGNORECASE)
+    s = _BODY_OPEN_RE.sub("", s)
+    s = _BODY_CLOSE_RE.sub("", s)
     return s.strip()
 
 
@@ -49,33 +79,32 @@ def ensure_table_sections(html: str) -> str:
     """
     def fix_one_table(tbl: str) -> str:
         # Already has thead/tbody
-        if re.search(r"<thead\b", tbl, flags=re.IGNORECASE) and re.search(r"<tbody\b", tbl, flags=re.IGNORECASE):
+        if _THEAD_RE.search(tbl) and _TBODY_RE.search(tbl):
             return tbl
 
         # Split rows
-        rows = re.findall(r"<tr\b.*?</tr>", tbl, flags=re.IGNORECASE | re.DOTALL)
+        rows = _ROW_RE.findall(tbl)
         if not rows:
             return tbl
 
         thead = rows[0]
         tbody = "".join(rows[1:]) if len(rows) > 1 else ""
         # Remove existing <tr>... from table to rebuild
-        inner = re.sub(r"(?is)<tr\b.*?</tr>", "", tbl)
+        inner = _ROW_RE.sub("", tbl)
         # Remove existing thead/tbody tags if any stray
-        inner = re.sub(r"(?is)</?(thead|tbody)\b[^>]*>", "", inner)
+        inner = _SECTION_TAG_RE.sub("", inner)
         # Insert our sections just before </table>
-        fixed = re.sub(
-            r"(?is)</table\s*>",
-            f"<thead>{thead}</thead><tbody>{tbody}</tbody></table>",
+        fixed = _TABLE_CLOSE_RE.sub(
+            lambda _: f"<thead>{thead}</thead><tbody>{tbody}</tbody></table>",
             inner
         )
         return fixed
 
-    return re.sub(
-        r"(?is)<table\b.*?</table\s*>",
-        lambda m: fix_one_table(m.group(0)),
-        html
-    )
+    # Most fragments have no table at all; skip the regex pass for them
+    if "<table" not in html.lower():
+        return html
+
+    return _TABLE_RE.sub(lambda m: fix_one_table(m.group(0)), html)
 
 
 def extract_html_body_fragment(text: str) -> str:
@@ -89,56 +118,55 @@ def extract_html_body_fragment(text: str) -> str:
     if not text:
         return ""
 
-    s = text.strip()
-
     # Strip code fences like ```html ... ```
-    if s.startswith("```"):
-        # remove starting fence
-        s = re.sub(r"^```[a-zA-Z0-9]*\s*", "", s, count=1)
-        # remove trailing fence
-        s = re.sub(r"\s*```$", "", s, count=1)
-        s = s.strip()
+    s = _strip_fence_markers(text.strip())
 
     # If a full HTML doc was returned, extract the body's inner HTML
-    body_match = re.search(r"<body[^>]*>(.*?)</body>", s, flags=re.IGNORECASE | re.DOTALL)
+    body_match = _BODY_STRICT_RE.search(s)
     if body_match:
         return body_match.group(1).strip()
 
     # If there is any tag at all, trim everything before the first tag
-    first_tag = re.search(r"<[a-zA-Z!/?]", s)
+    first_tag = _FIRST_TAG_RE.search(s)
     if first_tag:
         s = s[first_tag.start():].strip()
 
     # If it's still a full doc without a body (rare), remove doctype/html/head wrappers
     # and keep best-effort inner content after </head>
-    if re.search(r"<html[^>]*>", s, re.IGNORECASE):
+    if _HTML_OPEN_RE.search(s):
         # try to cut off head
-        after_head = re.split(r"</head\s*>", s, flags=re.IGNORECASE, maxsplit=1)
+        after_head = _HEAD_CLOSE_RE.split(s, maxsplit=1)
         if len(after_head) == 2:
             s = after_head[1].strip()
         # drop closing </html> if present
-        s = re.sub(r"</html\s*>", "", s, flags=re.IGNORECASE).strip()
+        s = _HTML_CLOSE_RE.sub("", s).strip()
 
     # If no tags at all, signal to caller to fallback
-    if not re.search(r"</?[a-zA-Z]+[^>]*>", s):
+    if not _ANY_TAG_RE.search(s):
         return ""
 
     return s
 
 
-def markdown_to_html_fallback(markdown_content: str) -> str:
+def _get_markdown_converter() -> markdown.Markdown:
+    """Get this thread's Markdown converter, so extensions are loaded once per thread."""
+    converter = getattr(_markdown_local, "converter", None)
+    if converter is None:
+        converter = markdown.Markdown(extensions=['tables', 'fenced_code', 'toc'])
+        _markdown_local.converter = converter
+    return converter
+
+
+def markdown_to_html(markdown_content: str) -> str:
     """
-    Fallback method to convert markdown to HTML using the markdown library.
+    Convert markdown to HTML locally using the markdown library.
     """
     try:
-        html = markdown.markdown(
-            markdown_content,
-            extensions=['tables', 'fenced_code', 'toc']
-        )
+        html = _get_markdown_converter().reset().convert(markdown_content)
         html = ensure_table_sections(html)
         return html
     except Exception as e:
-        logging.error(f"Fallback markdown conversion failed: {e}")
+        logging.error(f"Local markdown conversion failed: {e}")
         return f"<div><pre>{markdown_content}</pre></div>"
 
 
@@ -146,4 +174,4 @@ def validate_html_fragment(html: str) -> bool:
     """
     Validate that the provided string contains valid HTML tags.
     """
-    return bool(re.search(r"</?[a-zA-Z]+[^>]*>", html))
+    return bool(_ANY_TAG_RE.search(html))
@@ -1,17 +1,18 @@
 """LLM utilities and prompt templates for PDF report generation."""
 
 import logging
-from typing import Optional
-from langchain_core.messages import HumanMessage
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_azure_ai.chat_models import AzureAIChatCompletionsModel
 
 from ..core.config import settings
-from ..schemas.analysis import DebtAnalysisResult
 from ..schemas.pdf_report import MarkdownDoc, HtmlConversion, STRICT_NO_CHATTER_NOTE
 
 
+@lru_cache(maxsize=None)
 def get_llm(temperature: float = 0.7) -> AzureAIChatCompletionsModel:
-    """Get configured Azure AI LLM instance."""
+    """Get configured Azure AI LLM instance, shared process-wide per temperature."""
     return AzureAIChatCompletionsModel(
         endpoint=settings.AZURE_INFERENCE_ENDPOINT,
         credential=settings.AZURE_INFERENCE_CREDENTIAL,
@@ -21,134 +22,141 @@ def get_llm(temperature: float = 0.7) -> AzureAIChatCompletionsModel:
     )
 
 
-def generate_analysis_prompt(analysis: DebtAnalysisResult, context: dict) -> str:
-    """Generate prompt for financial analysis text generation."""
-    return f"""
-    You are a professional financial analyst. Generate a comprehensive financial report analysis based on the following data:
+# Only ask the model for the report as HTML when the LLM conversion path is enabled
+REPORT_HTML_REQUIREMENT = (
+    "- Also return the complete report in the 'html' field as clean, semantic HTML: #/##/### as <h1>/<h2>/<h3>, tables with <thead>/<tbody>, lists as <ul>/<li>, **bold** as <strong>, paragraphs as <p>. Use only semantic HTML—NO <!DOCTYPE>, <html>, <head>, or <body> tags.\n"
+    if settings.REPORT_HTML_WITH_LLM else ""
+)
 
-    CUSTOMER INFORMATION:
-    - Customer ID: {analysis.customer_id}
-    - Current Credit Score: {analysis.current_credit_score}
+# Static instructions are sent as the system message and kept byte-identical across
+# calls so the provider can serve them from its prompt cache; per-customer data goes
+# in the human message after them.
+REPORT_SYSTEM_PROMPT = f"""
+You are a professional financial analyst writing a well-structured Markdown financial report for the customer whose data is provided after the DATA marker.
+Return data ONLY via the structured schema provided by the tool—do not include any extra text.
 
-    PAYMENT STRATEGIES:
-    - Minimum Payment Strategy: {analysis.minimum_payment_strategy.months} months, ${analysis.minimum_payment_strategy.total_interest:,.2f} total interest
-    - Optimized Payment Strategy: {analysis.optimized_payment_strategy.months} months, ${analysis.optimized_payment_strategy.total_interest:,.2f} total interest
-    - Savings vs Minimum: ${analysis.savings_vs_minimum.interest_saved:,.2f} interest saved, {analysis.savings_vs_minimum.months_saved} months saved
+The report must provide a comprehensive analysis covering:
+1. Executive Summary of the customer's financial situation
+2. Detailed Payment Strategy Analysis comparing minimum vs optimized approaches
+3. Debt Consolidation Analysis (if applicable)
+4. Potential Savings Analysis with specific numbers
+5. Personalized Recommendations with actionable steps
 
-    CONSOLIDATION INFORMATION:
-    {context['consolidation']}
+Write in a professional, accessible tone that a customer can understand. Be specific with numbers and timeframes.
 
-    Please provide a comprehensive analysis covering:
-    1. Executive Summary of the customer's financial situation
-    2. Detailed Payment Strategy Analysis comparing minimum vs optimized approaches
-    3. Debt Consolidation Analysis (if applicable)
-    4. Potential Savings Analysis with specific numbers
-    5. Personalized Recommendations with actionable steps
+Requirements:
+- Use proper Markdown headers (#, ##, ###) in the final 'markdown' field if you provide it.
+- Include a valid GitHub-flavored Markdown table in 'financial_comparison_table_markdown'.
+- Format currency with symbols and thousands separators where applicable.
+- Recommendations should be clean bullet items in the 'recommendations' list (no leading '-' or numbering).
+- If you provide the 'markdown' field, it must be a complete report ready to render.
+- Use the report fixed values given after the DATA marker for the customer ID, report date and credit score.
+{REPORT_HTML_REQUIREMENT}
+Report structure (for the 'markdown' field if you choose to include it):
+# Personal Financial Analysis Report
 
-    Write in a professional, accessible tone that a customer can understand. Be specific with numbers and timeframes.
-    """
+**Customer ID:** <Customer ID>  
+**Report Date:** <Report Date>  
+**Credit Score:** <Credit Score>
 
+## Executive Summary
+...
 
-def generate_markdown_formatting_prompt(raw_analysis: str, analysis: DebtAnalysisResult) -> str:
-    """Generate prompt for formatting analysis into structured markdown."""
-    from datetime import datetime
-    
-    return f"""
-    You are formatting a financial analysis into a well-structured Markdown report.
-    Return data ONLY via the structured schema provided by the tool—do not include any extra text.
+## Payment Strategy Analysis
+...
 
-    Requirements:
-    - Use proper Markdown headers (#, ##, ###) in the final 'markdown' field if you provide it.
-    - Include a valid GitHub-flavored Markdown table in 'financial_comparison_table_markdown'.
-    - Format currency with symbols and thousands separators where applicable.
-    - Recommendations should be clean bullet items in the 'recommendations' list (no leading '-' or numbering).
-    - If you provide the 'markdown' field, it must be a complete report ready to render.
+### Financial Comparison Table
+{{financial_comparison_table_markdown}}
 
-    Context:
-    ANALYSIS TEXT:
-    {raw_analysis}
+## Debt Consolidation Analysis
+...
 
-    Report fixed values for this customer:
-    - Customer ID: {analysis.customer_id}
-    - Report Date: {datetime.now().strftime("%B %d, %Y")}
-    - Credit Score: {analysis.current_credit_score}
+## Potential Savings Analysis
+...
 
-    Report structure (for the 'markdown' field if you choose to include it):
-    # Personal Financial Analysis Report
+## Personalized Recommendations
+- ...
+- ...
+"""
 
-    **Customer ID:** {analysis.customer_id}  
-    **Report Date:** {datetime.now().strftime("%B %d, %Y")}  
-    **Credit Score:** {analysis.current_credit_score}
+REPORT_DATA_TEMPLATE = """
+    ---
+    DATA:
 
-    ## Executive Summary
-    ...
+    Report fixed values for this customer:
+    - Customer ID: {customer_id}
+    - Report Date: {report_date}
+    - Credit Score: {credit_score}
 
-    ## Payment Strategy Analysis
-    ...
+    PAYMENT STRATEGIES:
+    - Minimum Payment Strategy: {minimum_months} months, {minimum_total_interest} total interest
+    - Optimized Payment Strategy: {optimized_months} months, {optimized_total_interest} total interest
+    - Savings vs Minimum: {interest_saved} interest saved, {months_saved} months saved
 
-    ### Financial Comparison Table
-    {{
-    financial_comparison_table_markdown
-    }}
+    CONSOLIDATION INFORMATION:
+    {consolidation}
+    """
 
-    ## Debt Consolidation Analysis
-    ...
+HTML_SYSTEM_PROMPT = f"""
+Convert the Markdown content given after the MARKDOWN marker to clean, semantic HTML.
 
-    ## Potential Savings Analysis
-    ...
+{STRICT_NO_CHATTER_NOTE}
 
-    ## Personalized Recommendations
-    - ...
-    - ...
-    """
+REQUIREMENTS:
+- Convert #/##/### to <h1>/<h2>/<h3>.
+- Convert Markdown tables to HTML tables. Prefer <thead> for the header row and <tbody> for the rest.
+- Convert lists to <ul>/<ol>/<li>, **bold** to <strong>, *italic* to <em>, links to <a>.
+- Preserve paragraphs with <p>.
+- Use only semantic HTML—NO <!DOCTYPE>, <html>, <head>, or <body> tags.
 
+Return the result ONLY via the structured schema.
+"""
 
-def generate_html_conversion_prompt(markdown_content: str) -> str:
-    """Generate prompt for converting markdown to HTML."""
-    return f"""
-    Convert the following Markdown content to clean, semantic HTML.
-
-    {STRICT_NO_CHATTER_NOTE}
 
-    REQUIREMENTS:
-    - Convert #/##/### to <h1>/<h2>/<h3>.
-    - Convert Markdown tables to HTML tables. Prefer <thead> for the header row and <tbody> for the rest.
-    - Convert lists to <ul>/<ol>/<li>, **bold** to <strong>, *italic* to <em>, links to <a>.
-    - Preserve paragraphs with <p>.
-    - Use only semantic HTML—NO <!DOCTYPE>, <html>, <head>, or <body> tags.
+def generate_report_prompt(fields: Dict[str, Any], context: dict) -> str:
+    """Generate the per-customer data part of the report prompt from the preformatted report fields."""
+    return REPORT_DATA_TEMPLATE.format_map(fields | context)
 
-    Return the result ONLY via the structured schema.
 
+def generate_html_conversion_prompt(markdown_content: str) -> str:
+    """Generate the data part of the markdown to HTML conversion prompt."""
+    return f"""
+    ---
     MARKDOWN:
     {markdown_content}
     """
 
 
-def invoke_llm_for_analysis(llm: AzureAIChatCompletionsModel, prompt: str) -> str:
-    """Invoke LLM for analysis text generation with error handling."""
-    try:
-        response = llm.invoke([HumanMessage(content=prompt)])
-        return response.content if hasattr(response, 'content') else str(response)
-    except Exception as e:
-        logging.error(f"Error generating analysis text: {e}")
-        raise
+def _log_prompt_cache_usage(step: str, response) -> None:
+    """Log how many input tokens of an LLM response were served from the prompt cache."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+    logging.info(f"{step}: {usage.get('input_tokens', 0)} input tokens, {cached_tokens} cached")
+
+
+def _invoke_structured(llm: AzureAIChatCompletionsModel, schema, system_prompt: str, prompt: str, step: str):
+    """Invoke LLM with structured output, logging prompt cache usage from the raw response."""
+    parser = llm.with_structured_output(schema, include_raw=True)
+    result = parser.invoke([SystemMessage(content=system_prompt), HumanMessage(content=prompt)])
+    _log_prompt_cache_usage(step, result["raw"])
+    if result.get("parsing_error") is not None:
+        raise result["parsing_error"]
+    return result["parsed"]
 
 
-def invoke_llm_for_markdown(llm: AzureAIChatCompletionsModel, prompt: str) -> MarkdownDoc:
-    """Invoke LLM for structured markdown generation with error handling."""
+def invoke_llm_for_report(llm: AzureAIChatCompletionsModel, prompt: str) -> MarkdownDoc:
+    """Invoke LLM for structured report generation with error handling."""
     try:
-        parser = llm.with_structured_output(MarkdownDoc)
-        return parser.invoke([HumanMessage(content=prompt)])
+        return _invoke_structured(llm, MarkdownDoc, REPORT_SYSTEM_PROMPT, prompt, "Report generation")
     except Exception as e:
-        logging.error(f"Error formatting to markdown (structured): {e}")
+        logging.error(f"Error generating report (structured): {e}")
         raise
 
 
 def invoke_llm_for_html(llm: AzureAIChatCompletionsModel, prompt: str) -> HtmlConversion:
     """Invoke LLM for HTML conversion with error handling."""
     try:
-        parser = llm.with_structured_output(HtmlConversion)
-        return parser.invoke([HumanMessage(content=prompt)])
+        return _invoke_structured(llm, HtmlConversion, HTML_SYSTEM_PROMPT, prompt, "HTML conversion")
     except Exception as e:
         logging.error(f"Error converting markdown to HTML with LLM (structured): {e}")
         raise
@@ -1,22 +1,120 @@
-"""PDF generation utilities using WeasyPrint."""
+"""PDF generation utilities using WeasyPrint.
+
+WeasyPrint is imported on first use rather than at module import, so the API
+starts without loading it (and its Pango/cairo bindings) until a PDF is rendered.
+"""
 
 import logging
-from weasyprint import HTML
-from typing import Optional
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from weasyprint import CSS
+
+from .config import settings
+from .report_styles import PROFESSIONAL_CSS, SIMPLE_CSS, create_simple_html_document
+
+
+@lru_cache(maxsize=None)
+def get_professional_stylesheet() -> "CSS":
+    """Get the professional report stylesheet, parsed once and reused for every PDF."""
+    from weasyprint import CSS
+
+    return CSS(string=PROFESSIONAL_CSS)
+
 
-from .report_styles import create_simple_html_document
+@lru_cache(maxsize=None)
+def get_simple_stylesheet() -> "CSS":
+    """Get the fallback report stylesheet, parsed once and reused for every PDF."""
+    from weasyprint import CSS
+
+    return CSS(string=SIMPLE_CSS)
 
 
 def html_to_pdf(html_content: str) -> bytes:
-    """Convert styled HTML to PDF using WeasyPrint."""
+    """Convert HTML to PDF using WeasyPrint with the pre-parsed professional stylesheet."""
+    from weasyprint import HTML
+
     try:
         html_doc = HTML(string=html_content)
-        return html_doc.write_pdf()
+        return html_doc.write_pdf(stylesheets=[get_professional_stylesheet()])
     except Exception as e:
         logging.error(f"Error converting HTML to PDF: {e}")
         raise
 
 
+def _warm_pdf_worker() -> None:
+    """Load WeasyPrint and parse the shared stylesheets when a PDF worker process starts."""
+    get_professional_stylesheet()
+    get_simple_stylesheet()
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+# Set once a fresh pool also breaks (e.g. its workers can't load WeasyPrint), so PDFs
+# are rendered in-process instead of spawning a new pool for every report
+_pdf_pool_unusable = False
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Get the process pool used for PDF rendering, creating it on first use."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # Spawned workers do not inherit the server's threads and locks
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_WORKER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_pdf_worker,
+            )
+        return _pdf_pool
+
+
+def _reset_pdf_pool(broken_pool: ProcessPoolExecutor, unusable: bool = False) -> None:
+    """Discard a broken process pool so the next get_pdf_pool() call starts a fresh one."""
+    global _pdf_pool, _pdf_pool_unusable
+    with _pdf_pool_lock:
+        # Another thread may already have replaced it
+        if _pdf_pool is broken_pool:
+            _pdf_pool = None
+        if unusable:
+            _pdf_pool_unusable = True
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def html_to_pdf_in_worker(html_content: str) -> bytes:
+    """
+    Convert HTML to PDF in a worker process.
+
+    Rendering is CPU-bound and holds the GIL for the whole layout, so running it
+    in the process pool keeps the server responsive while reports are generated.
+    If a worker died (e.g. killed for running out of memory) the pool is broken
+    for good, so it is replaced and the render retried once on a fresh pool. If
+    that pool breaks as well, the pool is given up and PDFs are rendered in-process.
+    """
+    if _pdf_pool_unusable:
+        return html_to_pdf(html_content)
+
+    pool = get_pdf_pool()
+    try:
+        return pool.submit(html_to_pdf, html_content).result()
+    except BrokenProcessPool:
+        logging.warning("PDF worker pool is broken, restarting it and retrying the render")
+        _reset_pdf_pool(pool)
+
+    pool = get_pdf_pool()
+    try:
+        return pool.submit(html_to_pdf, html_content).result()
+    except BrokenProcessPool:
+        logging.error("PDF worker pool broke again, rendering PDFs in-process from now on")
+        _reset_pdf_pool(pool, unusable=True)
+        return html_to_pdf(html_content)
+
+
 def simple_html_to_pdf(html_content: str, title: str = "Financial Report") -> bytes:
     """
     Fallback method for HTML to PDF conversion with simple styling.
@@ -29,9 +127,11 @@ def simple_html_to_pdf(html_content: str, title: str = "Financial Report") -> by
         PDF bytes
     """
     try:
-        simple_html = create_simple_html_document(html_content, title)
+        from weasyprint import HTML
+
+        simple_html = create_simple_html_document(html_content, title, inline_css=False)
         html_doc = HTML(string=simple_html)
-        return html_doc.write_pdf()
+        return html_doc.write_pdf(stylesheets=[get_simple_stylesheet()])
     except Exception as e:
         logging.error(f"Fallback PDF generation failed: {e}")
         # Return empty bytes if all else fails
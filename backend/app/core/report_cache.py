@@ -0,0 +1,48 @@
+"""In-process cache of generated PDF reports keyed by the analysis they were built from."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.config import settings
+
+_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def analysis_cache_key(analysis: Dict[str, Any]) -> str:
+    """Hash the canonical JSON of a dumped analysis (DebtAnalysisResult.model_dump()) into a cache key."""
+    payload = json.dumps(analysis, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def get_cached_report(key: str) -> Optional[bytes]:
+    """Get cached PDF bytes for a key, or None if missing or expired."""
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+
+        stored_at, pdf_bytes = entry
+        if time.monotonic() - stored_at > settings.REPORT_CACHE_TTL_SECONDS:
+            del _cache[key]
+            return None
+
+        _cache.move_to_end(key)
+        return pdf_bytes
+
+
+def store_cached_report(key: str, pdf_bytes: bytes) -> None:
+    """Cache PDF bytes for a key, evicting the least recently used entries beyond the limit."""
+    # An empty PDF is a failed render, which must not be served again
+    if not pdf_bytes:
+        return
+
+    with _lock:
+        _cache[key] = (time.monotonic(), pdf_bytes)
+        _cache.move_to_end(key)
+        while len(_cache) > settings.REPORT_CACHE_MAXSIZE:
+            _cache.popitem(last=False)
@@ -1,10 +1,9 @@
 """CSS styles and HTML styling utilities for PDF reports."""
 
 
-def get_professional_css_styles() -> str:
-    """Get professional CSS styles for PDF reports."""
-    return """
-    <style>
+# Raw stylesheets, shared by the inline <style> blocks and the pre-parsed
+# WeasyPrint stylesheets in pdf_utils
+PROFESSIONAL_CSS = """
     body {
         font-family: 'Arial', 'Helvetica', sans-serif;
         line-height: 1.6;
@@ -117,36 +116,56 @@ def get_professional_css_styles() -> str:
             page-break-inside: avoid;
         }
     }
-    </style>
-    """
-
+"""
 
-def get_simple_css_styles() -> str:
-    """Get simple CSS styles for fallback PDF generation."""
-    return """
-    <style>
+SIMPLE_CSS = """
     body { font-family: Arial, sans-serif; margin: 20px; }
     h1 { color: #333; text-align: center; }
     h2 { color: #555; border-bottom: 1px solid #ddd; }
     table { border-collapse: collapse; width: 100%; }
     th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
     th { background-color: #f2f2f2; }
+"""
+
+
+# <style> blocks are assembled once and shared by every report document
+_PROFESSIONAL_STYLE_BLOCK = f"""
+    <style>
+{PROFESSIONAL_CSS}
     </style>
     """
 
+_SIMPLE_STYLE_BLOCK = f"""
+    <style>
+{SIMPLE_CSS}
+    </style>
+    """
+
+
+def get_professional_css_styles() -> str:
+    """Get professional CSS styles for PDF reports."""
+    return _PROFESSIONAL_STYLE_BLOCK
+
+
+def get_simple_css_styles() -> str:
+    """Get simple CSS styles for fallback PDF generation."""
+    return _SIMPLE_STYLE_BLOCK
+
 
-def create_styled_html_document(html_content: str, title: str = "Financial Analysis Report") -> str:
+def create_styled_html_document(html_content: str, title: str = "Financial Analysis Report", inline_css: bool = True) -> str:
     """
     Wrap HTML content in a complete HTML document with professional styling.
     
     Args:
         html_content: The body content HTML
         title: The document title
+        inline_css: Embed the stylesheet; disable when rendering with html_to_pdf,
+            which applies the pre-parsed stylesheet itself
         
     Returns:
         Complete styled HTML document
     """
-    css_styles = get_professional_css_styles()
+    css_styles = get_professional_css_styles() if inline_css else ""
     
     return f"""
     <!DOCTYPE html>
@@ -164,18 +183,20 @@ def create_styled_html_document(html_content: str, title: str = "Financial Analy
     """
 
 
-def create_simple_html_document(html_content: str, title: str = "Financial Report") -> str:
+def create_simple_html_document(html_content: str, title: str = "Financial Report", inline_css: bool = True) -> str:
     """
     Create a simple HTML document for fallback scenarios.
     
     Args:
         html_content: The body content HTML
         title: The document title
+        inline_css: Embed the stylesheet; disable when the caller applies the
+            pre-parsed stylesheet itself
         
     Returns:
         Simple HTML document
     """
-    css_styles = get_simple_css_styles()
+    css_styles = get_simple_css_styles() if inline_css else ""
     
     return f"""
     <!DOCTYPE html>
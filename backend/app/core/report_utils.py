@@ -1,48 +1,31 @@
 """Utilities for preparing report context and fallback content generation."""
 
 import logging
-from typing import Dict
+from typing import Any, Dict, Optional
 from datetime import datetime
 
-from ..schemas.analysis import DebtAnalysisResult
 
+# Report text templates, filled with format_map from the preformatted fields of an analysis
+CONSOLIDATION_CONTEXT_TEMPLATE = (
+    "Consolidation Option Available:\n"
+    "- Offer ID: {consolidation_offer_id}\n"
+    "- New Interest Rate: {consolidation_rate_pct}%\n"
+    "- Duration: {consolidation_months} months\n"
+    "- Total Interest: {consolidation_total_interest}\n"
+    "- Consolidated Amount: {consolidation_amount}\n\n"
+    "Consolidation vs Minimum Savings: {consolidation_vs_minimum_interest_saved} interest, {consolidation_vs_minimum_months_saved} months\n"
+    "Consolidation vs Optimized Savings: {consolidation_vs_optimized_interest_saved} interest, {consolidation_vs_optimized_months_saved} months"
+)
 
-def prepare_analysis_context(analysis: DebtAnalysisResult) -> Dict[str, str]:
-    """Prepare context data for analysis generation."""
-    context = {
-        "consolidation": ""
-    }
+FALLBACK_ANALYSIS_TEMPLATE = """
+    Financial Analysis for Customer {customer_id}
 
-    if getattr(analysis, "consolidation_option", None):
-        context["consolidation"] = (
-            f"Consolidation Option Available:\n"
-            f"- Offer ID: {analysis.consolidation_option.offer_id}\n"
-            f"- New Interest Rate: {analysis.consolidation_option.new_rate_pct}%\n"
-            f"- Duration: {analysis.consolidation_option.months} months\n"
-            f"- Total Interest: ${analysis.consolidation_option.total_interest:,.2f}\n"
-            f"- Consolidated Amount: ${analysis.consolidation_option.consolidated_amount:,.2f}\n\n"
-            f"Consolidation vs Minimum Savings: ${analysis.consolidation_savings.vs_minimum.interest_saved:,.2f} interest, {analysis.consolidation_savings.vs_minimum.months_saved} months\n"
-            f"Consolidation vs Optimized Savings: ${analysis.consolidation_savings.vs_optimized.interest_saved:,.2f} interest, {analysis.consolidation_savings.vs_optimized.months_saved} months"
-        )
-    else:
-        context["consolidation"] = getattr(
-            analysis, "consolidation_message", "No consolidation options are currently available for this customer."
-        )
-
-    return context
-
-
-def generate_fallback_analysis(analysis: DebtAnalysisResult) -> str:
-    """Generate fallback analysis if LLM fails."""
-    return f"""
-    Financial Analysis for Customer {analysis.customer_id}
-
-    Current Credit Score: {analysis.current_credit_score}
+    Current Credit Score: {credit_score}
 
     Payment Strategy Comparison:
-    - Minimum Payment: {analysis.minimum_payment_strategy.months} months, ${analysis.minimum_payment_strategy.total_interest:,.2f} total interest
-    - Optimized Payment: {analysis.optimized_payment_strategy.months} months, ${analysis.optimized_payment_strategy.total_interest:,.2f} total interest
-    - Potential Savings: ${analysis.savings_vs_minimum.interest_saved:,.2f} in interest and {analysis.savings_vs_minimum.months_saved} months
+    - Minimum Payment: {minimum_months} months, {minimum_total_interest} total interest
+    - Optimized Payment: {optimized_months} months, {optimized_total_interest} total interest
+    - Potential Savings: {interest_saved} in interest and {months_saved} months
 
     The optimized payment strategy offers significant benefits over the minimum payment approach, allowing the customer to save both time and money.
 
@@ -52,15 +35,12 @@ def generate_fallback_analysis(analysis: DebtAnalysisResult) -> str:
     3. Consider additional debt reduction strategies
     """
 
-
-def generate_fallback_markdown(analysis: DebtAnalysisResult, raw_analysis: str) -> str:
-    """Generate fallback markdown if formatting fails."""
-    return f"""
+FALLBACK_MARKDOWN_TEMPLATE = """
 # Personal Financial Analysis Report
 
-**Customer ID:** {analysis.customer_id}  
-**Report Date:** {datetime.now().strftime("%B %d, %Y")}  
-**Credit Score:** {analysis.current_credit_score}
+**Customer ID:** {customer_id}  
+**Report Date:** {report_date}  
+**Credit Score:** {credit_score}
 
 ## Analysis
 
@@ -70,13 +50,13 @@ def generate_fallback_markdown(analysis: DebtAnalysisResult, raw_analysis: str)
 
 | Strategy | Duration (Months) | Total Interest |
 |----------|------------------|----------------|
-| Minimum Payment | {analysis.minimum_payment_strategy.months} | ${analysis.minimum_payment_strategy.total_interest:,.2f} |
-| Optimized Payment | {analysis.optimized_payment_strategy.months} | ${analysis.optimized_payment_strategy.total_interest:,.2f} |
+| Minimum Payment | {minimum_months} | {minimum_total_interest} |
+| Optimized Payment | {optimized_months} | {optimized_total_interest} |
 
 ## Savings Potential
 
-- **Interest Saved:** ${analysis.savings_vs_minimum.interest_saved:,.2f}
-- **Time Saved:** {analysis.savings_vs_minimum.months_saved} months
+- **Interest Saved:** {interest_saved}
+- **Time Saved:** {months_saved} months
 
 ## Recommendations
 
@@ -86,6 +66,85 @@ def generate_fallback_markdown(analysis: DebtAnalysisResult, raw_analysis: str)
     """
 
 
+def format_currency(value: float) -> str:
+    """Format an amount as currency with thousands separators, e.g. $1,234.56."""
+    return f"${value:,.2f}"
+
+
+def report_fields(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten and format the figures used by the report text templates.
+
+    Computed once per report and shared by the prompt, the context and the fallbacks,
+    so each amount is formatted a single time.
+
+    Args:
+        analysis: The debt analysis as a plain dict (DebtAnalysisResult.model_dump())
+    """
+    minimum = analysis["minimum_payment_strategy"]
+    optimized = analysis["optimized_payment_strategy"]
+    savings = analysis["savings_vs_minimum"]
+
+    fields = {
+        "customer_id": analysis["customer_id"],
+        "credit_score": analysis["current_credit_score"],
+        "report_date": datetime.now().strftime("%B %d, %Y"),
+        "minimum_months": minimum["months"],
+        "minimum_total_interest": format_currency(minimum["total_interest"]),
+        "optimized_months": optimized["months"],
+        "optimized_total_interest": format_currency(optimized["total_interest"]),
+        "interest_saved": format_currency(savings["interest_saved"]),
+        "months_saved": savings["months_saved"],
+    }
+
+    option = analysis.get("consolidation_option")
+    if option:
+        vs_minimum = analysis["consolidation_savings"]["vs_minimum"]
+        vs_optimized = analysis["consolidation_savings"]["vs_optimized"]
+        fields.update(
+            consolidation_offer_id=option["offer_id"],
+            consolidation_rate_pct=option["new_rate_pct"],
+            consolidation_months=option["months"],
+            consolidation_total_interest=format_currency(option["total_interest"]),
+            consolidation_amount=format_currency(option["consolidated_amount"]),
+            consolidation_vs_minimum_interest_saved=format_currency(vs_minimum["interest_saved"]),
+            consolidation_vs_minimum_months_saved=vs_minimum["months_saved"],
+            consolidation_vs_optimized_interest_saved=format_currency(vs_optimized["interest_saved"]),
+            consolidation_vs_optimized_months_saved=vs_optimized["months_saved"],
+        )
+
+    return fields
+
+
+def prepare_analysis_context(analysis: Dict[str, Any], fields: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    """Prepare context data for analysis generation from the dumped analysis."""
+    context = {
+        "consolidation": ""
+    }
+
+    if analysis.get("consolidation_option"):
+        context["consolidation"] = CONSOLIDATION_CONTEXT_TEMPLATE.format_map(fields or report_fields(analysis))
+    else:
+        context["consolidation"] = analysis.get(
+            "consolidation_message", "No consolidation options are currently available for this customer."
+        )
+
+    return context
+
+
+def generate_fallback_analysis(analysis: Dict[str, Any], fields: Optional[Dict[str, Any]] = None) -> str:
+    """Generate fallback analysis if LLM fails."""
+    return FALLBACK_ANALYSIS_TEMPLATE.format_map(fields or report_fields(analysis))
+
+
+def generate_fallback_markdown(analysis: Dict[str, Any], raw_analysis: str,
+                               fields: Optional[Dict[str, Any]] = None) -> str:
+    """Generate fallback markdown if formatting fails."""
+    return FALLBACK_MARKDOWN_TEMPLATE.format_map(
+        (fields or report_fields(analysis)) | {"raw_analysis": raw_analysis}
+    )
+
+
 def assemble_markdown_from_structured_response(resp, fallback_title: str = "Personal Financial Analysis Report") -> str:
     """Assemble a clean Markdown document from structured response fields."""
     try:
@@ -1,6 +1,22 @@
-from typing import Generator
+from functools import lru_cache
+from typing import Dict, Generator, Optional
+import numpy as np
 import pandas as pd
 
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+# Storage dtypes per table; money and rates as float64, counters as int64
+_COLUMN_DTYPES = {
+    'loans': {'principal': np.float64, 'annual_rate_pct': np.float64,
+              'remaining_term_months': np.int64, 'days_past_due': np.int64},
+    'cards': {'balance': np.float64, 'annual_rate_pct': np.float64, 'min_payment_pct': np.float64,
+              'payment_due_day': np.int64, 'days_past_due': np.int64},
+    'payments_history': {'amount': np.float64},
+    'credit_score_history': {'credit_score': np.int64},
+    'customer_cashflow': {'monthly_income_avg': np.float64, 'income_variability_pct': np.float64,
+                          'essential_expenses_avg': np.float64},
+}
+
 
 class MockDatabase:
     """
@@ -10,6 +26,7 @@ class MockDatabase:
     def __init__(self):
         """Initialize database with hardcoded data"""
         self._init_dataframes()
+        self._init_indexes()
 
     def _init_dataframes(self):
         """Initialize all DataFrames from hardcoded list of dicts"""
@@ -72,6 +89,45 @@ class MockDatabase:
         ]
         self._customer_cashflow_df = pd.DataFrame(customer_cashflow_data)
 
+    def _init_indexes(self):
+        """Type each table once, index it by customer and cache the latest credit score per customer"""
+        self._tables = {
+            'loans': self._loans_df,
+            'cards': self._cards_df,
+            'payments_history': self._payments_history_df,
+            'credit_score_history': self._credit_score_history_df,
+            'customer_cashflow': self._customer_cashflow_df,
+        }
+        for name, df in self._tables.items():
+            for column, dtype in _COLUMN_DTYPES[name].items():
+                df[column] = df[column].astype(dtype)
+
+        self._columns = {}
+        self._customer_codes = {}
+        self._sorted_codes = {}
+        self._row_order = {}
+        for name, df in self._tables.items():
+            self._columns[name] = {column: df[column].to_numpy() for column in df.columns}
+
+            customer_ids = df['customer_id'].astype('category')
+            codes = customer_ids.cat.codes.to_numpy()
+            order = np.argsort(codes, kind='stable')
+            self._customer_codes[name] = {
+                customer_id: code for code, customer_id in enumerate(customer_ids.cat.categories)
+            }
+            self._sorted_codes[name] = codes[order]
+            self._row_order[name] = order
+
+        latest_scores = (
+            self._credit_score_history_df
+            .sort_values('date', kind='stable')
+            .groupby('customer_id')['credit_score']
+            .last()
+        )
+        self._latest_scores = {
+            customer_id: int(score) for customer_id, score in latest_scores.items()
+        }
+
     def get_loans(self) -> pd.DataFrame:
         return self._loans_df.copy()
 
@@ -90,21 +146,40 @@ class MockDatabase:
     def get_customer_data(self, customer_id: str) -> dict:
         """Get all data for a specific customer"""
         return {
-            'loans': self._loans_df[self._loans_df['customer_id'] == customer_id].copy(),
-            'cards': self._cards_df[self._cards_df['customer_id'] == customer_id].copy(),
-            'payments_history': self._payments_history_df[self._payments_history_df['customer_id'] == customer_id].copy(),
-            'credit_score_history': self._credit_score_history_df[self._credit_score_history_df['customer_id'] == customer_id].copy(),
-            'customer_cashflow': self._customer_cashflow_df[self._customer_cashflow_df['customer_id'] == customer_id].copy()
+            name: df.iloc[self._rows(name, customer_id)].copy()
+            for name, df in self._tables.items()
         }
 
+    def _rows(self, table: str, customer_id: str) -> np.ndarray:
+        """Positions of a customer's rows in a table, in table order"""
+        code = self._customer_codes[table].get(customer_id)
+        if code is None:
+            return _NO_ROWS
+        sorted_codes = self._sorted_codes[table]
+        start = np.searchsorted(sorted_codes, code, side='left')
+        end = np.searchsorted(sorted_codes, code, side='right')
+        return self._row_order[table][start:end]
+
+    def take(self, table: str, customer_id: str) -> Dict[str, np.ndarray]:
+        """Get a customer's rows of a table as numpy columns, without building a DataFrame"""
+        rows = self._rows(table, customer_id)
+        return {column: values[rows] for column, values in self._columns[table].items()}
+
+    def latest_score(self, customer_id: str) -> Optional[int]:
+        """Get the most recent credit score for a customer"""
+        return self._latest_scores.get(customer_id)
+
     def close(self):
         pass
 
 
+@lru_cache(maxsize=1)
+def get_database() -> MockDatabase:
+    """Get the process-wide database, so its tables and customer index are built once at startup"""
+    return MockDatabase()
+
+
 def get_db() -> Generator[MockDatabase, None, None]:
     """Get database instance for dependency injection"""
-    db = MockDatabase()
-    try:
-        yield db
-    finally:
-        db.close()
+    # The shared instance is read-only: getters return copies and take() gathers new arrays
+    yield get_database()
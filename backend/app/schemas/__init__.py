@@ -42,6 +42,7 @@ from .customer import (
     CustomerBase,
     CustomerProfile,
     CustomerSummary,
+    CustomerBundle,
 )
 
 # Analysis schemas
@@ -81,6 +82,7 @@ __all__ = [
     "CustomerBase",
     "CustomerProfile",
     "CustomerSummary",
+    "CustomerBundle",
     
     # Analysis
 ]
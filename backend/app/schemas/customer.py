@@ -34,3 +34,9 @@ class CustomerSummary(CustomerBase):
     current_credit_score: Optional[int] = Field(None, description="Most recent credit score")
     financial_health_score: Optional[int] = Field(None, description="Overall financial health score")
     risk_level: Optional[str] = Field(None, description="Risk assessment level")
+
+
+class CustomerBundle(BaseSchema):
+    """Customer profile and summary, returned together in one response"""
+    profile: CustomerProfile = Field(..., description="Complete customer profile")
+    summary: CustomerSummary = Field(..., description="Customer financial summary")
@@ -5,7 +5,7 @@ from typing import Optional, List, Dict, Any, TypedDict
 from pydantic import BaseModel, Field
 
 from .base import BaseSchema
-from .analysis import ConsolidationOffer, DebtAnalysisResult
+from .analysis import ConsolidationOffer
 
 
 class PDFReportRequest(BaseSchema):
@@ -43,6 +43,10 @@ class MarkdownDoc(BaseModel):
         default=None,
         description="(Optional) Full, ready-to-render Markdown for the entire report."
     )
+    html: Optional[str] = Field(
+        default=None,
+        description="(Optional) The same full report as a clean semantic HTML fragment WITHOUT doctype/html/head/body wrappers."
+    )
 
 
 class HtmlConversion(BaseModel):
@@ -64,11 +68,11 @@ class HtmlConversion(BaseModel):
 
 class ReportState(TypedDict):
     """State for the LangGraph workflow in PDF report generation."""
-    analysis_data: DebtAnalysisResult
-    raw_analysis: str
+    analysis_dict: Dict[str, Any]
     markdown_content: str
-    styled_html: str
+    html_content: str
     pdf_bytes: bytes
+    used_fallback: bool
 
 
 class ReportContext(BaseModel):
@@ -1,11 +1,11 @@
-import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Any
-from decimal import Decimal
-from app.services.azure_ai_service import AzureAIService
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from app.services.azure_ai_service import AzureAIService, get_azure_ai_service
 from fastapi import Depends
 import logging
 
+from ..core.config import settings
 from ..db.database import MockDatabase, get_db
 from ..schemas.analysis import (
     ConsolidationOffer,
@@ -21,47 +21,38 @@ from ..schemas.analysis import (
 class AnalysisService:
     """Service for financial analysis and restructuring (read-only)"""
 
-    def __init__(self, db: MockDatabase = Depends(get_db), azure_ai_service: AzureAIService = Depends()):
+    def __init__(self, db: MockDatabase = Depends(get_db), azure_ai_service: AzureAIService = Depends(get_azure_ai_service)):
         self.db = db
         self.azure_ai_service = azure_ai_service
 
-    def _convert_to_dict(self, df_row) -> Dict[str, Any]:
-        """Convert pandas DataFrame row to dictionary with proper data types"""
-        result = {}
-        for key, value in df_row.items():
-            if isinstance(value, Decimal):
-                result[key] = float(value)
-            else:
-                result[key] = value
-        return result
+    def _fast_customer_state(self, customer_id: str) -> Tuple[Optional[int], Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Get latest credit score plus loan and card columns for a customer"""
+        return (
+            self.db.latest_score(customer_id),
+            self.db.take('loans', customer_id),
+            self.db.take('cards', customer_id),
+        )
 
-    def _pmt(self, principal: pd.Series, annual_rate_pct: pd.Series, n_months: pd.Series) -> pd.Series:
-        """Calculate payment amount for loans using pandas vectorized operations"""
+    def _pmt_array(self, principal: np.ndarray, annual_rate_pct: np.ndarray, n_months: np.ndarray) -> np.ndarray:
+        """Calculate payment amount for loans using numpy vectorized operations"""
         r = annual_rate_pct / 100 / 12
-        # Handle edge cases
-        result = pd.Series(index=principal.index, dtype=float)
-
-        # Case 1: n_months <= 0
-        mask_zero_months = n_months <= 0
-        result.loc[mask_zero_months] = principal.loc[mask_zero_months]
-
-        # Case 2: rate is 0
-        mask_zero_rate = (r == 0) & (~mask_zero_months)
-        result.loc[mask_zero_rate] = principal.loc[mask_zero_rate] / \
-            n_months.loc[mask_zero_rate]
+        safe_months = np.where(n_months > 0, n_months, 1)
 
-        # Case 3: normal calculation
-        mask_normal = (~mask_zero_months) & (~mask_zero_rate)
-        if mask_normal.any():
-            r_normal = r.loc[mask_normal]
-            n_normal = n_months.loc[mask_normal]
-            p_normal = principal.loc[mask_normal]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = (1 + r) ** safe_months
+            payment = principal * r * growth / (growth - 1)
 
-            result.loc[mask_normal] = p_normal * \
-                (r_normal * (1 + r_normal)**n_normal) / \
-                ((1 + r_normal)**n_normal - 1)
+        # Edge cases: rate is 0, or no months left
+        payment = np.where(r == 0, principal / safe_months, payment)
+        return np.where(n_months <= 0, principal, payment)
 
-        return result
+    def _highest_rate_index(self, rates: np.ndarray, active: np.ndarray) -> Optional[int]:
+        """Get the index of the active debt with the highest rate (last index wins ties)"""
+        candidates = np.flatnonzero(active)
+        if candidates.size == 0:
+            return None
+        candidate_rates = rates[candidates]
+        return int(candidates[candidates.size - 1 - np.argmax(candidate_rates[::-1])])
 
     def _check_eligibility_with_ai(self, customer_data: Dict, offer: ConsolidationOffer, credit_score: int) -> bool:
         """
@@ -210,105 +201,61 @@ class AnalysisService:
         Simulate minimum payment strategy for a customer
         Returns months to payoff and total interest paid
         """
-        customer_data = self.db.get_customer_data(customer_id)
+        _, loans, cards = self._fast_customer_state(customer_id)
 
-        # Work directly with DataFrames for better performance
-        loans_df = customer_data['loans'].copy()
-        cards_df = customer_data['cards'].copy()
+        # Simulation state as numpy arrays
+        loan_P = loans['principal'].astype(np.float64)
+        loan_rate = loans['annual_rate_pct'].astype(np.float64)
+        loan_term = loans['remaining_term_months'].astype(np.int64)
+        card_B = cards['balance'].astype(np.float64)
+        card_rate = cards['annual_rate_pct'].astype(np.float64)
+        card_min_pct = cards['min_payment_pct'].astype(np.float64)
 
-        total_interest, months = 0.0, 0
+        loan_r = loan_rate / 100 / 12
+        card_r = card_rate / 100 / 12
 
-        # Convert to float for calculations
-        if not loans_df.empty:
-            loans_df['principal'] = loans_df['principal'].astype(float)
-            loans_df['annual_rate_pct'] = loans_df['annual_rate_pct'].astype(
-                float)
-            loans_df['remaining_term_months'] = loans_df['remaining_term_months'].astype(
-                int)
+        total_interest, months = 0.0, 0
 
-        if not cards_df.empty:
-            cards_df['balance'] = cards_df['balance'].astype(float)
-            cards_df['annual_rate_pct'] = cards_df['annual_rate_pct'].astype(
-                float)
-            cards_df['min_payment_pct'] = cards_df['min_payment_pct'].astype(
-                float)
-
-        def done():
-            loans_done = loans_df.empty or (
-                loans_df['principal'] <= 1e-6).all()
-            cards_done = cards_df.empty or (cards_df['balance'] <= 1e-6).all()
-            return loans_done and cards_done
-
-        while not done() and months < 1000:
+        while ((loan_P > 1e-6).any() or (card_B > 1e-6).any()) and months < 1000:
             months += 1
 
-            # Process loans using pandas operations
-            if not loans_df.empty:
-                active_loans = loans_df['principal'] > 1e-6
-                if active_loans.any():
-                    # Calculate monthly interest
-                    monthly_rates = loans_df.loc[active_loans,
-                                                 'annual_rate_pct'] / 100 / 12
-                    interest = loans_df.loc[active_loans,
-                                            'principal'] * monthly_rates
-                    total_interest += interest.sum()
-
-                    # Calculate payments
-                    payments = self._pmt(
-                        loans_df.loc[active_loans, 'principal'],
-                        loans_df.loc[active_loans, 'annual_rate_pct'],
-                        loans_df.loc[active_loans,
-                                     'remaining_term_months'].clip(lower=1)
-                    )
-
-                    # Calculate payoffs and principal reductions
-                    payoffs = loans_df.loc[active_loans,
-                                           'principal'] + interest
-                    actual_payments = np.minimum(payments, payoffs)
-                    principal_reductions = actual_payments - interest
-
-                    # Update principals and terms
-                    loans_df.loc[active_loans, 'principal'] = np.maximum(
-                        0.0, loans_df.loc[active_loans,
-                                          'principal'] - principal_reductions
-                    )
-                    loans_df.loc[active_loans, 'remaining_term_months'] = np.maximum(
-                        1, loans_df.loc[active_loans,
-                                        'remaining_term_months'] - 1
-                    )
-
-            # Process cards using pandas operations
-            if not cards_df.empty:
-                active_cards = cards_df['balance'] > 1e-6
-                if active_cards.any():
-                    # Calculate monthly interest
-                    monthly_rates = cards_df.loc[active_cards,
-                                                 'annual_rate_pct'] / 100 / 12
-                    interest = cards_df.loc[active_cards,
-                                            'balance'] * monthly_rates
-                    total_interest += interest.sum()
-
-                    # Calculate minimum payments
-                    min_payments = np.maximum(
-                        cards_df.loc[active_cards, 'balance'] *
-                        (cards_df.loc[active_cards, 'min_payment_pct'] / 100),
-                        interest + 1.0
-                    )
-
-                    # Calculate payoffs and principal reductions
-                    payoffs = cards_df.loc[active_cards, 'balance'] + interest
-                    actual_payments = np.minimum(min_payments, payoffs)
-                    principal_reductions = actual_payments - interest
+            # Process loans
+            active_loans = loan_P > 1e-6
+            if active_loans.any():
+                balances = loan_P[active_loans]
+                interest = balances * loan_r[active_loans]
+                total_interest += interest.sum()
+
+                payments = self._pmt_array(
+                    balances,
+                    loan_rate[active_loans],
+                    np.maximum(1, loan_term[active_loans])
+                )
+                actual_payments = np.minimum(payments, balances + interest)
+
+                loan_P[active_loans] = np.maximum(
+                    0.0, balances - (actual_payments - interest))
+                loan_term[active_loans] = np.maximum(1, loan_term[active_loans] - 1)
+
+            # Process cards
+            active_cards = card_B > 1e-6
+            if active_cards.any():
+                balances = card_B[active_cards]
+                interest = balances * card_r[active_cards]
+                total_interest += interest.sum()
+
+                min_payments = np.maximum(
+                    balances * card_min_pct[active_cards] / 100,
+                    interest + 1.0
+                )
+                actual_payments = np.minimum(min_payments, balances + interest)
 
-                    # Update balances
-                    cards_df.loc[active_cards, 'balance'] = np.maximum(
-                        0.0, cards_df.loc[active_cards,
-                                          'balance'] - principal_reductions
-                    )
+                card_B[active_cards] = np.maximum(
+                    0.0, balances - (actual_payments - interest))
 
         return PaymentSimulationResult(
             months=months,
-            total_interest=total_interest
+            total_interest=float(total_interest)
         )
 
     def simulate_optimized_payments(self, customer_id: str, cure_dpd_first: bool = True) -> PaymentSimulationResult:
@@ -316,191 +263,91 @@ class AnalysisService:
         Simulate optimized payment strategy (avalanche method)
         Returns months to payoff and total interest paid
         """
-        customer_data = self.db.get_customer_data(customer_id)
+        cashflow = self.db.take('customer_cashflow', customer_id)
 
-        if customer_data['customer_cashflow'].empty:
+        if cashflow['customer_id'].size == 0:
             raise ValueError(
                 f"No cashflow data found for customer {customer_id}")
 
         # Get cashflow data
-        cashflow_row = customer_data['customer_cashflow'].iloc[0]
-        income = float(cashflow_row['monthly_income_avg'])
-        essential = float(cashflow_row['essential_expenses_avg'])
-        variability = float(cashflow_row['income_variability_pct']) / 100
+        income = float(cashflow['monthly_income_avg'][0])
+        essential = float(cashflow['essential_expenses_avg'][0])
+        variability = float(cashflow['income_variability_pct'][0]) / 100
         budget = max(0.0, income - essential - income * variability)
 
-        # Work with DataFrames
-        loans_df = customer_data['loans'].copy()
-        cards_df = customer_data['cards'].copy()
+        _, loans, cards = self._fast_customer_state(customer_id)
 
-        # Convert to float for calculations
-        if not loans_df.empty:
-            loans_df['principal'] = loans_df['principal'].astype(float)
-            loans_df['annual_rate_pct'] = loans_df['annual_rate_pct'].astype(
-                float)
-            loans_df['remaining_term_months'] = loans_df['remaining_term_months'].astype(
-                int)
-            loans_df['days_past_due'] = loans_df['days_past_due'].astype(int)
+        # Simulation state as numpy arrays
+        loan_P = loans['principal'].astype(np.float64)
+        loan_rate = loans['annual_rate_pct'].astype(np.float64)
+        loan_term = loans['remaining_term_months'].astype(np.int64)
+        card_B = cards['balance'].astype(np.float64)
+        card_rate = cards['annual_rate_pct'].astype(np.float64)
+        card_min_pct = cards['min_payment_pct'].astype(np.float64)
 
-        if not cards_df.empty:
-            cards_df['balance'] = cards_df['balance'].astype(float)
-            cards_df['annual_rate_pct'] = cards_df['annual_rate_pct'].astype(
-                float)
-            cards_df['min_payment_pct'] = cards_df['min_payment_pct'].astype(
-                float)
-            cards_df['days_past_due'] = cards_df['days_past_due'].astype(int)
+        loan_r = loan_rate / 100 / 12
+        card_r = card_rate / 100 / 12
 
-        total_interest, months = 0.0, 0
+        # Avalanche priority never changes during the simulation: delinquent debts first
+        # (when curing DPD), then highest rate, then cards before loans in row order
+        n_cards = card_B.size
+        delinquent = np.concatenate((cards['days_past_due'] > 0, loans['days_past_due'] > 0))
+        debt_priority = np.where(cure_dpd_first & delinquent, 0, 1)
+        priority_order = np.lexsort(
+            (-np.concatenate((card_rate, loan_rate)), debt_priority))
 
-        def calculate_minimum_payments():
-            """Calculate minimum payments for all active debts"""
-            total_min = 0.0
-            loan_payments = pd.Series(dtype=float)
-            card_payments = pd.Series(dtype=float)
-
-            if not loans_df.empty:
-                active_loans = loans_df['principal'] > 1e-6
-                if active_loans.any():
-                    loan_payments = self._pmt(
-                        loans_df.loc[active_loans, 'principal'],
-                        loans_df.loc[active_loans, 'annual_rate_pct'],
-                        loans_df.loc[active_loans,
-                                     'remaining_term_months'].clip(lower=1)
-                    )
-                    total_min += loan_payments.sum()
-
-            if not cards_df.empty:
-                active_cards = cards_df['balance'] > 1e-6
-                if active_cards.any():
-                    monthly_rates = cards_df.loc[active_cards,
-                                                 'annual_rate_pct'] / 100 / 12
-                    interest = cards_df.loc[active_cards,
-                                            'balance'] * monthly_rates
-                    card_payments = np.maximum(
-                        cards_df.loc[active_cards, 'balance'] *
-                        (cards_df.loc[active_cards, 'min_payment_pct'] / 100),
-                        interest + 1.0
-                    )
-                    total_min += card_payments.sum()
-
-            return total_min, loan_payments, card_payments
-
-        def get_priority_debt():
-            """Get the highest priority debt for extra payments"""
-            debts = []
-
-            # Add loans
-            if not loans_df.empty:
-                active_loans = loans_df['principal'] > 1e-6
-                for idx in loans_df[active_loans].index:
-                    loan = loans_df.loc[idx]
-                    priority = (
-                        0 if (
-                            cure_dpd_first and loan['days_past_due'] > 0) else 1,
-                        # Negative for descending sort
-                        -loan['annual_rate_pct']
-                    )
-                    debts.append((priority, 'loan', idx, loan['principal']))
-
-            # Add cards
-            if not cards_df.empty:
-                active_cards = cards_df['balance'] > 1e-6
-                for idx in cards_df[active_cards].index:
-                    card = cards_df.loc[idx]
-                    priority = (
-                        0 if (
-                            cure_dpd_first and card['days_past_due'] > 0) else 1,
-                        # Negative for descending sort
-                        -card['annual_rate_pct']
-                    )
-                    debts.append((priority, 'card', idx, card['balance']))
-
-            if not debts:
-                return None
-
-            debts.sort()
-            return debts[0]
-
-        def done():
-            loans_done = loans_df.empty or (
-                loans_df['principal'] <= 1e-6).all()
-            cards_done = cards_df.empty or (cards_df['balance'] <= 1e-6).all()
-            return loans_done and cards_done
+        total_interest, months = 0.0, 0
 
-        while not done() and months < 1000:
+        while ((loan_P > 1e-6).any() or (card_B > 1e-6).any()) and months < 1000:
             months += 1
 
+            active_loans = loan_P > 1e-6
+            active_cards = card_B > 1e-6
+
             # Calculate monthly interest
-            if not loans_df.empty:
-                active_loans = loans_df['principal'] > 1e-6
-                if active_loans.any():
-                    monthly_rates = loans_df.loc[active_loans,
-                                                 'annual_rate_pct'] / 100 / 12
-                    interest = loans_df.loc[active_loans,
-                                            'principal'] * monthly_rates
-                    total_interest += interest.sum()
-
-            if not cards_df.empty:
-                active_cards = cards_df['balance'] > 1e-6
-                if active_cards.any():
-                    monthly_rates = cards_df.loc[active_cards,
-                                                 'annual_rate_pct'] / 100 / 12
-                    interest = cards_df.loc[active_cards,
-                                            'balance'] * monthly_rates
-                    total_interest += interest.sum()
+            loan_interest = loan_P[active_loans] * loan_r[active_loans]
+            card_interest = card_B[active_cards] * card_r[active_cards]
+            total_interest += loan_interest.sum() + card_interest.sum()
 
             # Calculate minimum payments
-            mins_total, loan_payments, card_payments = calculate_minimum_payments()
-            extra = max(0.0, budget - mins_total)
+            loan_payments = self._pmt_array(
+                loan_P[active_loans],
+                loan_rate[active_loans],
+                np.maximum(1, loan_term[active_loans])
+            )
+            card_payments = np.maximum(
+                card_B[active_cards] * card_min_pct[active_cards] / 100,
+                card_interest + 1.0
+            )
+            extra = max(0.0, budget - (loan_payments.sum() + card_payments.sum()))
 
             # Apply minimum payments to loans
-            if not loan_payments.empty:
-                for idx, payment in loan_payments.items():
-                    if loans_df.loc[idx, 'principal'] > 1e-6:
-                        monthly_rate = loans_df.loc[idx,
-                                                    'annual_rate_pct'] / 100 / 12
-                        interest = loans_df.loc[idx,
-                                                'principal'] * monthly_rate
-                        payoff = loans_df.loc[idx, 'principal'] + interest
-                        actual_payment = min(payment, payoff)
-                        principal_reduction = actual_payment - interest
-
-                        loans_df.loc[idx, 'principal'] = max(
-                            0.0, loans_df.loc[idx, 'principal'] - principal_reduction)
-                        loans_df.loc[idx, 'remaining_term_months'] = max(
-                            1, loans_df.loc[idx, 'remaining_term_months'] - 1)
+            balances = loan_P[active_loans]
+            actual_payments = np.minimum(loan_payments, balances + loan_interest)
+            loan_P[active_loans] = np.maximum(
+                0.0, balances - (actual_payments - loan_interest))
+            loan_term[active_loans] = np.maximum(1, loan_term[active_loans] - 1)
 
             # Apply minimum payments to cards
-            if not card_payments.empty:
-                for idx, payment in card_payments.items():
-                    if cards_df.loc[idx, 'balance'] > 1e-6:
-                        monthly_rate = cards_df.loc[idx,
-                                                    'annual_rate_pct'] / 100 / 12
-                        interest = cards_df.loc[idx, 'balance'] * monthly_rate
-                        payoff = cards_df.loc[idx, 'balance'] + interest
-                        actual_payment = min(payment, payoff)
-                        principal_reduction = actual_payment - interest
-
-                        cards_df.loc[idx, 'balance'] = max(
-                            0.0, cards_df.loc[idx, 'balance'] - principal_reduction)
+            balances = card_B[active_cards]
+            actual_payments = np.minimum(card_payments, balances + card_interest)
+            card_B[active_cards] = np.maximum(
+                0.0, balances - (actual_payments - card_interest))
 
             # Apply extra payment using avalanche method
             if extra > 1e-6:
-                priority_debt = get_priority_debt()
-                if priority_debt:
-                    _, debt_type, idx, current_balance = priority_debt
-                    if debt_type == "loan":
-                        payment = min(extra, loans_df.loc[idx, 'principal'])
-                        loans_df.loc[idx, 'principal'] = max(
-                            0.0, loans_df.loc[idx, 'principal'] - payment)
-                    else:  # card
-                        payment = min(extra, cards_df.loc[idx, 'balance'])
-                        cards_df.loc[idx, 'balance'] = max(
-                            0.0, cards_df.loc[idx, 'balance'] - payment)
+                active = np.concatenate((card_B, loan_P))[priority_order] > 1e-6
+                if active.any():
+                    idx = int(priority_order[np.argmax(active)])
+                    if idx >= n_cards:
+                        idx -= n_cards
+                        loan_P[idx] = max(0.0, loan_P[idx] - min(extra, loan_P[idx]))
+                    else:
+                        card_B[idx] = max(0.0, card_B[idx] - min(extra, card_B[idx]))
 
         return PaymentSimulationResult(
             months=months,
-            total_interest=total_interest
+            total_interest=float(total_interest)
         )
 
     def get_eligible_offers(self, customer_id: str, offers: List[ConsolidationOffer], credit_score: int) -> EligibleOffersResponse:
@@ -516,28 +363,34 @@ class AnalysisService:
         eligible = []
         ai_used_count = 0
 
-        for offer in offers:
-            try:
-                # Use the refactored eligibility checking method
-                is_eligible = self._check_eligibility_with_ai(
-                    customer_data, offer, credit_score)
-
-                # Count AI usage only if there were conditions to evaluate
-                if offer.conditions and offer.conditions.strip() and offer.conditions.lower() not in ['none', 'none specified', '']:
-                    ai_used_count += 1
-
-                if is_eligible:
-                    eligible.append(offer)
-                    logging.info(
-                        f"Offer {offer.offer_id} approved for customer {customer_id}")
-                else:
-                    logging.info(
-                        f"Offer {offer.offer_id} rejected for customer {customer_id}")
-
-            except Exception as e:
-                logging.error(f"Error evaluating offer {offer.offer_id}: {e}")
-                # Skip this offer if there's an error in evaluation
-                continue
+        # Offers are evaluated independently, so their AI condition checks can run concurrently
+        max_workers = max(1, min(settings.TOOL_CONCURRENCY_LIMIT, len(offers)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._check_eligibility_with_ai, customer_data, offer, credit_score)
+                for offer in offers
+            ]
+
+            for offer, future in zip(offers, futures):
+                try:
+                    is_eligible = future.result()
+
+                    # Count AI usage only if there were conditions to evaluate
+                    if offer.conditions and offer.conditions.strip() and offer.conditions.lower() not in ['none', 'none specified', '']:
+                        ai_used_count += 1
+
+                    if is_eligible:
+                        eligible.append(offer)
+                        logging.info(
+                            f"Offer {offer.offer_id} approved for customer {customer_id}")
+                    else:
+                        logging.info(
+                            f"Offer {offer.offer_id} rejected for customer {customer_id}")
+
+                except Exception as e:
+                    logging.error(f"Error evaluating offer {offer.offer_id}: {e}")
+                    # Skip this offer if there's an error in evaluation
+                    continue
 
         # Sort by rate (lowest first) - prioritize customer benefit
         eligible_sorted = sorted(eligible, key=lambda x: x.new_rate_pct)
@@ -579,205 +432,115 @@ class AnalysisService:
         offer = eligible_offers_response.eligible_offers[0]
         types_eligible = set(offer.product_types_eligible)
 
-        # Use pandas operations to calculate consolidation amounts
-        loans_df = customer_data['loans'].copy()
-        cards_df = customer_data['cards'].copy()
-
-        consolidated_amount = 0.0
-        remaining_loans_list = []
-        remaining_cards_list = []
-
-        # Process loans
-        if not loans_df.empty:
-            consolidate_loans = loans_df['product_type'].isin(types_eligible)
-            consolidated_amount += loans_df.loc[consolidate_loans,
-                                                'principal'].sum()
+        _, loans, cards = self._fast_customer_state(customer_id)
 
-            # Convert remaining loans to list of dicts
-            remaining_loans = loans_df.loc[~consolidate_loans]
-            remaining_loans_list = [self._convert_to_dict(
-                row) for _, row in remaining_loans.iterrows()]
+        # Split loans into consolidated and remaining
+        consolidate_loans = np.isin(loans['product_type'], list(types_eligible))
+        remaining_loans = ~consolidate_loans
+        consolidated_amount = float(loans['principal'][consolidate_loans].sum())
 
-        # Process cards
-        if not cards_df.empty and "card" in types_eligible:
-            consolidated_amount += cards_df['balance'].sum()
-        elif not cards_df.empty:
-            # All cards remain if not eligible for consolidation
-            remaining_cards_list = [self._convert_to_dict(
-                row) for _, row in cards_df.iterrows()]
+        # Cards are consolidated all together or remain as they are
+        consolidate_cards = "card" in types_eligible
+        if consolidate_cards:
+            consolidated_amount += float(cards['balance'].sum())
 
         consolidated_amount = min(
             consolidated_amount, offer.max_consolidated_balance)
         if consolidated_amount <= 0:
             return None
 
-        # Create new consolidation loan
-        new_loan = {
-            "loan_id": f"CONS-{offer.offer_id}-{customer_id}",
-            "customer_id": customer_id,
-            "product_type": "consolidation",
-            "principal": consolidated_amount,
-            "annual_rate_pct": offer.new_rate_pct,
-            "remaining_term_months": offer.max_term_months,
-            "collateral": False,
-            "days_past_due": 0
-        }
-
-        # Simulate payment with new loan structure using simplified logic
-        all_loans = [new_loan] + remaining_loans_list
-        all_cards = remaining_cards_list
-
-        # Create DataFrames for simulation
-        sim_loans_df = pd.DataFrame(all_loans) if all_loans else pd.DataFrame()
-        sim_cards_df = pd.DataFrame(all_cards) if all_cards else pd.DataFrame()
-
-        # Convert to proper dtypes if not empty
-        if not sim_loans_df.empty:
-            sim_loans_df['principal'] = sim_loans_df['principal'].astype(float)
-            sim_loans_df['annual_rate_pct'] = sim_loans_df['annual_rate_pct'].astype(
-                float)
-            sim_loans_df['remaining_term_months'] = sim_loans_df['remaining_term_months'].astype(
-                int)
-
-        if not sim_cards_df.empty:
-            sim_cards_df['balance'] = sim_cards_df['balance'].astype(float)
-            sim_cards_df['annual_rate_pct'] = sim_cards_df['annual_rate_pct'].astype(
-                float)
-            sim_cards_df['min_payment_pct'] = sim_cards_df['min_payment_pct'].astype(
-                float)
+        # Simulation state as numpy arrays: new consolidation loan first, followed by the remaining debts
+        loan_P = np.concatenate(
+            ([consolidated_amount], loans['principal'][remaining_loans])).astype(np.float64)
+        loan_rate = np.concatenate(
+            ([offer.new_rate_pct], loans['annual_rate_pct'][remaining_loans])).astype(np.float64)
+        loan_term = np.concatenate(
+            ([offer.max_term_months], loans['remaining_term_months'][remaining_loans])).astype(np.int64)
+
+        if consolidate_cards:
+            card_B = np.empty(0, dtype=np.float64)
+            card_rate = np.empty(0, dtype=np.float64)
+            card_min_pct = np.empty(0, dtype=np.float64)
+        else:
+            card_B = cards['balance'].astype(np.float64)
+            card_rate = cards['annual_rate_pct'].astype(np.float64)
+            card_min_pct = cards['min_payment_pct'].astype(np.float64)
+
+        loan_r = loan_rate / 100 / 12
+        card_r = card_rate / 100 / 12
+
+        # Balances at or below epsilon count as paid off, so snap them to zero and
+        # keep running totals: termination becomes an O(1) check
+        loan_P[loan_P <= 1e-6] = 0.0
+        card_B[card_B <= 1e-6] = 0.0
+        loan_total, card_total = loan_P.sum(), card_B.sum()
 
         total_interest, months = 0.0, 0
 
-        def done():
-            loans_done = sim_loans_df.empty or (
-                sim_loans_df['principal'] <= 1e-6).all()
-            cards_done = sim_cards_df.empty or (
-                sim_cards_df['balance'] <= 1e-6).all()
-            return loans_done and cards_done
-
-        while not done() and months < 1000:
+        while loan_total + card_total > 1e-6 and months < 1000:
             months += 1
 
+            active_loans = loan_P > 1e-6
+            active_cards = card_B > 1e-6
+
             # Calculate monthly interest
-            monthly_interest = 0.0
-            if not sim_loans_df.empty:
-                active_loans = sim_loans_df['principal'] > 1e-6
-                if active_loans.any():
-                    loan_interest = (sim_loans_df.loc[active_loans, 'principal'] *
-                                     sim_loans_df.loc[active_loans, 'annual_rate_pct'] / 100 / 12)
-                    monthly_interest += loan_interest.sum()
-
-            if not sim_cards_df.empty:
-                active_cards = sim_cards_df['balance'] > 1e-6
-                if active_cards.any():
-                    card_interest = (sim_cards_df.loc[active_cards, 'balance'] *
-                                     sim_cards_df.loc[active_cards, 'annual_rate_pct'] / 100 / 12)
-                    monthly_interest += card_interest.sum()
-
-            total_interest += monthly_interest
+            loan_interest = loan_P[active_loans] * loan_r[active_loans]
+            card_interest = card_B[active_cards] * card_r[active_cards]
+            total_interest += loan_interest.sum() + card_interest.sum()
 
             # Calculate minimum payments needed
-            total_min_needed = 0.0
-            if not sim_loans_df.empty:
-                active_loans = sim_loans_df['principal'] > 1e-6
-                if active_loans.any():
-                    loan_payments = self._pmt(
-                        sim_loans_df.loc[active_loans, 'principal'],
-                        sim_loans_df.loc[active_loans, 'annual_rate_pct'],
-                        sim_loans_df.loc[active_loans,
-                                         'remaining_term_months'].clip(lower=1)
-                    )
-                    total_min_needed += loan_payments.sum()
-
-            if not sim_cards_df.empty:
-                active_cards = sim_cards_df['balance'] > 1e-6
-                if active_cards.any():
-                    card_interest = (sim_cards_df.loc[active_cards, 'balance'] *
-                                     sim_cards_df.loc[active_cards, 'annual_rate_pct'] / 100 / 12)
-                    min_card_payments = np.maximum(
-                        sim_cards_df.loc[active_cards, 'balance'] *
-                        (sim_cards_df.loc[active_cards,
-                         'min_payment_pct'] / 100),
-                        card_interest + 1.0
-                    )
-                    total_min_needed += min_card_payments.sum()
+            loan_payments = self._pmt_array(
+                loan_P[active_loans],
+                loan_rate[active_loans],
+                np.maximum(1, loan_term[active_loans])
+            )
+            card_payments = np.maximum(
+                card_B[active_cards] * card_min_pct[active_cards] / 100,
+                card_interest + 1.0
+            )
+            total_min_needed = loan_payments.sum() + card_payments.sum()
 
             if budget < total_min_needed:
                 # Cannot afford minimum payments, break
                 break
 
             # Apply payments - simplified approach: pay minimums then extra to highest rate
-            available_budget = budget
+            available_budget = budget - total_min_needed
 
             # Pay loan minimums
-            if not sim_loans_df.empty:
-                active_loans = sim_loans_df['principal'] > 1e-6
-                for idx in sim_loans_df[active_loans].index:
-                    principal = sim_loans_df.loc[idx, 'principal']
-                    rate = sim_loans_df.loc[idx, 'annual_rate_pct']
-                    term = max(
-                        1, sim_loans_df.loc[idx, 'remaining_term_months'])
-
-                    min_payment = self._pmt(pd.Series([principal]), pd.Series(
-                        [rate]), pd.Series([term])).iloc[0]
-                    interest = principal * rate / 100 / 12
-                    principal_payment = min(min_payment - interest, principal)
-
-                    sim_loans_df.loc[idx, 'principal'] = max(
-                        0.0, principal - principal_payment)
-                    sim_loans_df.loc[idx, 'remaining_term_months'] = max(
-                        1, term - 1)
-                    available_budget -= min_payment
+            balances = loan_P[active_loans]
+            new_balances = np.maximum(
+                0.0, balances - np.minimum(loan_payments - loan_interest, balances))
+            new_balances[new_balances <= 1e-6] = 0.0
+            loan_total -= (balances - new_balances).sum()
+            loan_P[active_loans] = new_balances
+            loan_term[active_loans] = np.maximum(1, loan_term[active_loans] - 1)
 
             # Pay card minimums
-            if not sim_cards_df.empty:
-                active_cards = sim_cards_df['balance'] > 1e-6
-                for idx in sim_cards_df[active_cards].index:
-                    balance = sim_cards_df.loc[idx, 'balance']
-                    rate = sim_cards_df.loc[idx, 'annual_rate_pct']
-                    min_pct = sim_cards_df.loc[idx, 'min_payment_pct']
-
-                    interest = balance * rate / 100 / 12
-                    min_payment = max(balance * min_pct / 100, interest + 1.0)
-                    principal_payment = min(min_payment - interest, balance)
-
-                    sim_cards_df.loc[idx, 'balance'] = max(
-                        0.0, balance - principal_payment)
-                    available_budget -= min_payment
-
-            # Apply extra to highest rate debt
+            balances = card_B[active_cards]
+            new_balances = np.maximum(
+                0.0, balances - np.minimum(card_payments - card_interest, balances))
+            new_balances[new_balances <= 1e-6] = 0.0
+            card_total -= (balances - new_balances).sum()
+            card_B[active_cards] = new_balances
+
+            # Apply extra to highest rate debt (loans win ties)
             if available_budget > 1e-6:
-                all_debts = []
-
-                # Add loans
-                if not sim_loans_df.empty:
-                    active_loans = sim_loans_df['principal'] > 1e-6
-                    for idx in sim_loans_df[active_loans].index:
-                        all_debts.append(
-                            (sim_loans_df.loc[idx, 'annual_rate_pct'], 'loan', idx))
-
-                # Add cards
-                if not sim_cards_df.empty:
-                    active_cards = sim_cards_df['balance'] > 1e-6
-                    for idx in sim_cards_df[active_cards].index:
-                        all_debts.append(
-                            (sim_cards_df.loc[idx, 'annual_rate_pct'], 'card', idx))
-
-                if all_debts:
-                    # Sort by rate (highest first)
-                    all_debts.sort(reverse=True)
-                    rate, debt_type, idx = all_debts[0]
-
-                    if debt_type == 'loan':
-                        payment = min(available_budget,
-                                      sim_loans_df.loc[idx, 'principal'])
-                        sim_loans_df.loc[idx, 'principal'] = max(
-                            0.0, sim_loans_df.loc[idx, 'principal'] - payment)
-                    else:  # card
-                        payment = min(available_budget,
-                                      sim_cards_df.loc[idx, 'balance'])
-                        sim_cards_df.loc[idx, 'balance'] = max(
-                            0.0, sim_cards_df.loc[idx, 'balance'] - payment)
+                loan_idx = self._highest_rate_index(loan_rate, loan_P > 1e-6)
+                card_idx = self._highest_rate_index(card_rate, card_B > 1e-6)
+
+                if loan_idx is not None and (card_idx is None or loan_rate[loan_idx] >= card_rate[card_idx]):
+                    payment = min(available_budget, loan_P[loan_idx])
+                    new_balance = max(0.0, loan_P[loan_idx] - payment)
+                    new_balance = new_balance if new_balance > 1e-6 else 0.0
+                    loan_total -= loan_P[loan_idx] - new_balance
+                    loan_P[loan_idx] = new_balance
+                elif card_idx is not None:
+                    payment = min(available_budget, card_B[card_idx])
+                    new_balance = max(0.0, card_B[card_idx] - payment)
+                    new_balance = new_balance if new_balance > 1e-6 else 0.0
+                    card_total -= card_B[card_idx] - new_balance
+                    card_B[card_idx] = new_balance
 
         return ConsolidationSimulationResult(
             offer_id=offer.offer_id,
@@ -794,16 +557,23 @@ class AnalysisService:
         optimized payments, and consolidation options
         """
         # Get current credit score
-        customer_data = self.db.get_customer_data(customer_id)
-        if customer_data['credit_score_history'].empty:
+        latest_score = self.db.latest_score(customer_id)
+        if latest_score is None:
             raise ValueError(
                 f"No credit score data found for customer {customer_id}")
 
-        latest_score = customer_data['credit_score_history'].iloc[-1]['credit_score']
+        # Run simulations concurrently - they are independent and only read customer data
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            min_future = executor.submit(
+                self.simulate_minimum_payments, customer_id)
+            opt_future = executor.submit(
+                self.simulate_optimized_payments, customer_id)
+            consolidation_future = executor.submit(
+                self.simulate_consolidation, customer_id, consolidation_offers, latest_score) if consolidation_offers else None
 
-        # Run simulations
-        min_result = self.simulate_minimum_payments(customer_id)
-        opt_result = self.simulate_optimized_payments(customer_id)
+            min_result = min_future.result()
+            opt_result = opt_future.result()
+            consolidation_result = consolidation_future.result() if consolidation_future else None
 
         # Calculate savings vs minimum
         savings_vs_min = SavingsComparison(
@@ -822,8 +592,6 @@ class AnalysisService:
 
         # Add consolidation analysis if offers provided
         if consolidation_offers:
-            consolidation_result = self.simulate_consolidation(
-                customer_id, consolidation_offers, latest_score)
             if consolidation_result:
                 analysis.consolidation_option = consolidation_result
                 analysis.consolidation_savings = ConsolidationSavings(
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from typing import Dict, Optional
 from fastapi import HTTPException
 from pydantic import BaseModel, Field
@@ -8,11 +9,35 @@ from ..core.config import settings
 from ..schemas.analysis import ConsolidationOffer
 
 
+class ConditionEvaluationResponse(BaseModel):
+    """Structured AI response for consolidation condition evaluation"""
+    meets_conditions: bool = Field(
+        description="Does the customer meet the specific conditions?")
+    reasoning: str = Field(
+        description="Brief explanation of the decision")
+
+
+CONDITION_EVALUATION_PROMPT = """
+Evaluate if this customer meets the specific conditions for this consolidation offer.
+
+Customer Profile:
+- Credit Score: {credit_score}
+- Maximum Days Past Due: {max_days_past_due}
+- Has Active Delinquency: {has_active_delinquency}
+- Total Debt: ${total_debt:,.2f}
+- Debt-to-Income Ratio: {debt_to_income_ratio:.2%}
+- Payment History: {payment_history}
+
+Specific Conditions to Evaluate: {conditions}
+"""
+
+
 class AzureAIService:
     """Service for Azure AI operations"""
 
     def __init__(self):
         self.azure_ai_manager = None
+        self._condition_evaluator = None
         self._init_azure_ai()
 
     def _init_azure_ai(self):
@@ -25,6 +50,8 @@ class AzureAIService:
                     credential=settings.AZURE_INFERENCE_CREDENTIAL,
                     model=settings.AZURE_INFERENCE_MODEL,
                 )
+                self._condition_evaluator = self.azure_ai_manager.with_structured_output(
+                    schema=ConditionEvaluationResponse)
                 logging.info("Azure AI manager initialized successfully")
             else:
                 logging.warning("Azure AI credentials not provided")
@@ -59,30 +86,11 @@ class AzureAIService:
 
         try:
             # Create focused prompt for AI analysis of conditions only
-            prompt = f"""
-            Evaluate if this customer meets the specific conditions for this consolidation offer.
-
-            Customer Profile:
-            - Credit Score: {customer_profile['credit_score']}
-            - Maximum Days Past Due: {customer_profile['max_days_past_due']}
-            - Has Active Delinquency: {customer_profile['has_active_delinquency']}
-            - Total Debt: ${customer_profile['total_debt']:,.2f}
-            - Debt-to-Income Ratio: {customer_profile['debt_to_income_ratio']:.2%}
-            - Payment History: {customer_profile['payment_history']}
-            
-            Specific Conditions to Evaluate: {offer.conditions}
-            """
-
-            class ConditionEvaluationResponse(BaseModel):
-                meets_conditions: bool = Field(
-                    description="Does the customer meet the specific conditions?")
-                reasoning: str = Field(
-                    description="Brief explanation of the decision")
+            prompt = CONDITION_EVALUATION_PROMPT.format_map(
+                customer_profile | {"conditions": offer.conditions})
 
             # Get AI response
-            model = self.azure_ai_manager.with_structured_output(
-                schema=ConditionEvaluationResponse)
-            response = model.invoke(prompt)
+            response = self._condition_evaluator.invoke(prompt)
             
             logging.info(
                 f"AI conditions evaluation for offer {offer.offer_id}: {response.reasoning}")
@@ -91,3 +99,9 @@ class AzureAIService:
         except Exception as e:
             logging.error(f"Error in AI conditions evaluation: {e}")
             return False  # Default to not eligible if AI evaluation fails
+
+
+@lru_cache(maxsize=1)
+def get_azure_ai_service() -> AzureAIService:
+    """Get the process-wide Azure AI service, so the client and its connections are reused across requests"""
+    return AzureAIService()
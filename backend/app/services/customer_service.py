@@ -3,11 +3,12 @@ Customer service for retrieving customer information
 """
 from typing import List, Optional
 from decimal import Decimal
+import numpy as np
 from fastapi import Depends
 
 from ..db.database import MockDatabase, get_db
 from ..schemas.customer import (
-    CustomerProfile, CustomerSummary
+    CustomerProfile, CustomerSummary, CustomerBundle
 )
 from ..schemas.loan import Loan
 from ..schemas.card import Card
@@ -24,8 +25,25 @@ class CustomerService:
 
     def get_customer_profile(self, customer_id: str) -> Optional[CustomerProfile]:
         """Get complete customer profile with all financial data"""
+        return self._build_profile(customer_id, self.db.get_customer_data(customer_id))
+
+    def get_customer_summary(self, customer_id: str) -> Optional[CustomerSummary]:
+        """Get customer financial summary"""
+        return self._build_summary(customer_id, self.db.get_customer_data(customer_id))
+
+    def get_customer_bundle(self, customer_id: str) -> Optional[CustomerBundle]:
+        """Get customer profile and summary together, so clients need a single request"""
+        # Both are built from one lookup of the customer's tables
         customer_data = self.db.get_customer_data(customer_id)
-        
+        profile = self._build_profile(customer_id, customer_data)
+        summary = self._build_summary(customer_id, customer_data)
+        if profile is None or summary is None:
+            return None
+        return CustomerBundle(profile=profile, summary=summary)
+
+    @staticmethod
+    def _build_profile(customer_id: str, customer_data: dict) -> Optional[CustomerProfile]:
+        """Build the customer profile from the customer's tables"""
         # Check if customer exists
         if (customer_data['loans'].empty and 
             customer_data['cards'].empty and 
@@ -69,37 +87,36 @@ class CustomerService:
             cashflow=cashflow
         )
 
-    def get_customer_summary(self, customer_id: str) -> Optional[CustomerSummary]:
-        """Get customer financial summary"""
-        customer_data = self.db.get_customer_data(customer_id)
-        
+    @staticmethod
+    def _build_summary(customer_id: str, customer_data: dict) -> Optional[CustomerSummary]:
+        """Build the customer financial summary from the customer's tables"""
         # Check if customer exists
         if (customer_data['loans'].empty and 
             customer_data['cards'].empty and 
             customer_data['credit_score_history'].empty):
             return None
 
-        # Calculate total debt
-        total_debt = Decimal('0')
-        total_monthly_payments = Decimal('0')
-        
-        # Add loan debt and payments
-        for _, loan in customer_data['loans'].iterrows():
-            total_debt += Decimal(str(loan['principal']))
-            # Calculate monthly payment (simple estimation)
-            monthly_rate = Decimal(str(loan['annual_rate_pct'])) / Decimal('100') / Decimal('12')
-            term = int(loan['remaining_term_months'])
-            if term > 0 and monthly_rate > 0:
-                monthly_payment = (Decimal(str(loan['principal'])) * monthly_rate * 
-                                 (1 + monthly_rate) ** term) / ((1 + monthly_rate) ** term - 1)
-                total_monthly_payments += monthly_payment
-
-        # Add card debt and minimum payments
-        for _, card in customer_data['cards'].iterrows():
-            balance = Decimal(str(card['balance']))
-            total_debt += balance
-            min_payment = balance * Decimal(str(card['min_payment_pct'])) / Decimal('100')
-            total_monthly_payments += min_payment
+        loans_df = customer_data['loans']
+        cards_df = customer_data['cards']
+
+        # Do the math in float64 and only convert to Decimal at the boundary
+        principal = loans_df['principal'].to_numpy(dtype=np.float64)
+        monthly_rate = loans_df['annual_rate_pct'].to_numpy(dtype=np.float64) / 100 / 12
+        term = loans_df['remaining_term_months'].to_numpy(dtype=np.int64)
+        balance = cards_df['balance'].to_numpy(dtype=np.float64)
+        min_payment_pct = cards_df['min_payment_pct'].to_numpy(dtype=np.float64)
+
+        # Loan payments (annuity formula), only for loans with a positive term and rate
+        amortizing = (term > 0) & (monthly_rate > 0)
+        growth = (1 + monthly_rate[amortizing]) ** term[amortizing]
+        loan_payments = principal[amortizing] * monthly_rate[amortizing] * growth / (growth - 1)
+
+        # Card minimum payments
+        card_payments = balance * min_payment_pct / 100
+
+        total_debt = Decimal(f"{principal.sum() + balance.sum():.2f}")
+        total_monthly_payments = Decimal(
+            f"{loan_payments.sum() + card_payments.sum():.2f}")
 
         # Get current credit score
         current_credit_score = None
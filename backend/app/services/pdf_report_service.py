@@ -3,20 +3,21 @@ Refactored PDF Report Service using LangGraph workflow.
 This service coordinates the generation of comprehensive PDF financial reports.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from datetime import datetime
-from langgraph.graph import StateGraph, END
+from functools import lru_cache
+from langchain_core.runnables import RunnableConfig
 
+from ..core.config import settings
 from ..schemas.analysis import DebtAnalysisResult
 from ..schemas.pdf_report import ReportState, MarkdownDoc
 from ..core.llm_utils import (
     get_llm, 
-    generate_analysis_prompt, 
-    generate_markdown_formatting_prompt,
+    generate_report_prompt,
     generate_html_conversion_prompt,
-    invoke_llm_for_analysis,
-    invoke_llm_for_markdown,
+    invoke_llm_for_report,
     invoke_llm_for_html
 )
 from ..core.html_utils import (
@@ -24,17 +25,25 @@ from ..core.html_utils import (
     remove_html_wrappers,
     ensure_table_sections,
     extract_html_body_fragment,
-    markdown_to_html_fallback,
+    markdown_to_html,
     validate_html_fragment
 )
 from ..core.report_styles import create_styled_html_document
 from ..core.report_utils import (
+    report_fields,
     prepare_analysis_context,
     generate_fallback_analysis,
     generate_fallback_markdown,
     assemble_markdown_from_structured_response
 )
-from ..core.pdf_utils import html_to_pdf, simple_html_to_pdf, save_pdf_to_file
+from ..core.pdf_utils import html_to_pdf_in_worker, simple_html_to_pdf, save_pdf_to_file
+from ..core.report_cache import analysis_cache_key, get_cached_report, store_cached_report
+
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+
+# Bounds concurrent report workflows so bursts stay within the Azure AI rate limits
+_report_semaphore = asyncio.Semaphore(settings.REPORT_CONCURRENCY_LIMIT)
 
 
 class PDFReportService:
@@ -42,53 +51,73 @@ class PDFReportService:
 
     def __init__(self, llm=None):
         self.llm = llm or get_llm()
-        self.graph = self._build_graph()
+        self.graph = type(self)._shared_graph()
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _shared_graph(cls) -> "CompiledStateGraph":
+        """
+        Build and compile the LangGraph workflow once per process.
+
+        The nodes hold no instance state; each run passes its LLM through
+        config["configurable"]["llm"], so one compiled graph serves every instance.
+        """
+        # Imported here so LangGraph is only loaded once a report service is created
+        from langgraph.graph import StateGraph, END
 
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow for PDF report generation."""
         workflow = StateGraph(ReportState)
         
         # Add nodes
-        workflow.add_node("generate_text", self._generate_analysis_text)
-        workflow.add_node("format_markdown", self._format_to_markdown)
-        workflow.add_node("convert_to_pdf", self._convert_to_styled_html_and_pdf)
+        workflow.add_node("generate_markdown", cls._generate_markdown_report)
+        workflow.add_node("convert_to_pdf", cls._convert_to_styled_html_and_pdf)
         
         # Add edges
-        workflow.set_entry_point("generate_text")
-        workflow.add_edge("generate_text", "format_markdown")
-        workflow.add_edge("format_markdown", "convert_to_pdf")
+        workflow.set_entry_point("generate_markdown")
+        workflow.add_edge("generate_markdown", "convert_to_pdf")
         workflow.add_edge("convert_to_pdf", END)
         
         return workflow.compile()
 
-    def _generate_analysis_text(self, state: ReportState) -> ReportState:
-        """Node 1: Generate comprehensive text analysis from the debt analysis data."""
-        analysis = state["analysis_data"]
-        
-        # Prepare the analysis context
-        context = prepare_analysis_context(analysis)
-        
-        # Generate the prompt and invoke LLM
-        prompt = generate_analysis_prompt(analysis, context)
-        
-        try:
-            raw_analysis = invoke_llm_for_analysis(self.llm, prompt)
-        except Exception as e:
-            logging.error(f"LLM analysis generation failed: {e}")
-            raw_analysis = generate_fallback_analysis(analysis)
+    @staticmethod
+    def _initial_state(analysis_dict: Dict[str, Any]) -> ReportState:
+        """Initial graph state for one customer's report, from the dumped analysis."""
+        return ReportState(
+            analysis_dict=analysis_dict,
+            markdown_content="",
+            html_content="",
+            pdf_bytes=b"",
+            used_fallback=False
+        )
+
+    def _run_config(self) -> RunnableConfig:
+        """Config for one graph run, carrying this instance's LLM to the nodes."""
+        return {"configurable": {"llm": self.llm}}
+
+    @staticmethod
+    def _cache_final_report(cache_key: str, final_state: ReportState) -> None:
+        """Cache a finished report, unless it is empty or was built from a fallback."""
+        # Fallback reports stand in for a failed LLM call or render; the next request should retry
+        if final_state["pdf_bytes"] and not final_state["used_fallback"]:
+            store_cached_report(cache_key, final_state["pdf_bytes"])
 
-        state["raw_analysis"] = raw_analysis
-        return state
+    @staticmethod
+    def _generate_markdown_report(state: ReportState, config: RunnableConfig) -> Dict[str, Any]:
+        """Node 1: Generate the structured markdown report directly from the debt analysis data."""
+        analysis = state["analysis_dict"]
+        llm = config["configurable"]["llm"]
 
-    def _format_to_markdown(self, state: ReportState) -> ReportState:
-        """Node 2: Format the analysis text into structured markdown for PDF conversion."""
-        raw_analysis = state["raw_analysis"]
-        analysis = state["analysis_data"]
+        # Format the report figures once and prepare the analysis context
+        fields = report_fields(analysis)
+        context = prepare_analysis_context(analysis, fields)
 
-        prompt = generate_markdown_formatting_prompt(raw_analysis, analysis)
+        # Generate the prompt and invoke LLM once for the whole report
+        prompt = generate_report_prompt(fields, context)
+
+        html_content = ""
+        used_fallback = False
 
         try:
-            resp: MarkdownDoc = invoke_llm_for_markdown(self.llm, prompt)
+            resp: MarkdownDoc = invoke_llm_for_report(llm, prompt)
 
             # Prefer the model's full 'markdown' if present; otherwise assemble from sections.
             if resp.markdown and resp.markdown.strip():
@@ -96,52 +125,71 @@ class PDFReportService:
             else:
                 markdown_content = assemble_markdown_from_structured_response(resp)
 
+            # The same call may already return the report as HTML, saving the conversion call
+            if settings.REPORT_HTML_WITH_LLM and resp.html and resp.html.strip():
+                html_content = PDFReportService._clean_html_fragment(resp.html) or ""
+
         except Exception as e:
-            logging.error(f"Markdown formatting failed: {e}")
-            markdown_content = generate_fallback_markdown(analysis, raw_analysis)
+            logging.error(f"LLM report generation failed: {e}")
+            markdown_content = generate_fallback_markdown(
+                analysis, generate_fallback_analysis(analysis, fields), fields)
+            used_fallback = True
 
-        state["markdown_content"] = markdown_content
-        return state
+        # Return only the updated keys; LangGraph merges them into the state
+        return {"markdown_content": markdown_content, "html_content": html_content,
+                "used_fallback": used_fallback}
 
-    def _convert_to_styled_html_and_pdf(self, state: ReportState) -> ReportState:
-        """Node 3: Convert markdown to styled HTML and then to PDF."""
+    @staticmethod
+    def _convert_to_styled_html_and_pdf(state: ReportState, config: RunnableConfig) -> Dict[str, Any]:
+        """Node 2: Convert markdown to styled HTML and then to PDF."""
         markdown_content = state["markdown_content"]
         
-        # Convert markdown to HTML
-        html_content = self._markdown_to_html_with_llm(markdown_content)
+        # Markdown to HTML is deterministic, so it is converted locally unless the LLM path is enabled
+        if settings.REPORT_HTML_WITH_LLM:
+            html_content = state["html_content"] or PDFReportService._markdown_to_html_with_llm(
+                config["configurable"]["llm"], markdown_content)
+        else:
+            html_content = markdown_to_html(markdown_content)
 
         # Extract the body content from the HTML
         body_content = extract_html_body_fragment(html_content)
 
-        # Add professional styling
-        styled_html = create_styled_html_document(body_content)
-        state["styled_html"] = styled_html
+        # Wrap in the report document; html_to_pdf applies the pre-parsed professional stylesheet
+        styled_html = create_styled_html_document(body_content, inline_css=False)
         
         # Convert HTML to PDF
+        used_fallback = state["used_fallback"]
         try:
-            pdf_bytes = html_to_pdf(styled_html)
-            state["pdf_bytes"] = pdf_bytes
+            pdf_bytes = html_to_pdf_in_worker(styled_html)
         except Exception as e:
             logging.error(f"Error converting HTML to PDF: {e}")
             # Fallback to simple HTML to PDF conversion
-            state["pdf_bytes"] = simple_html_to_pdf(html_content)
+            pdf_bytes = simple_html_to_pdf(html_content)
+            used_fallback = True
         
-        return state
+        return {"pdf_bytes": pdf_bytes, "used_fallback": used_fallback}
+
+    @staticmethod
+    def _clean_html_fragment(html: str) -> Optional[str]:
+        """Clean an LLM-produced HTML fragment; returns None if it contains no HTML."""
+        # Clean any possible code fences or wrappers the model might still sneak in
+        html = strip_code_fences(html)
+        html = remove_html_wrappers(html)
+        html = ensure_table_sections(html)
 
-    def _markdown_to_html_with_llm(self, markdown_content: str) -> str:
+        # Minimal sanity: ensure we return *some* HTML
+        return html if validate_html_fragment(html) else None
+
+    @staticmethod
+    def _markdown_to_html_with_llm(llm, markdown_content: str) -> str:
         """Use LLM (structured output) to convert Markdown to a clean HTML fragment."""
         prompt = generate_html_conversion_prompt(markdown_content)
         
         try:
-            resp = invoke_llm_for_html(self.llm, prompt)
-
-            # Clean any possible code fences or wrappers the model might still sneak in
-            html = strip_code_fences(resp.html)
-            html = remove_html_wrappers(html)
-            html = ensure_table_sections(html)
+            resp = invoke_llm_for_html(llm, prompt)
 
-            # Minimal sanity: ensure we return *some* HTML; else fallback.
-            if not validate_html_fragment(html):
+            html = PDFReportService._clean_html_fragment(resp.html)
+            if html is None:
                 raise ValueError("Model returned no HTML tags.")
 
             return html
@@ -149,7 +197,7 @@ class PDFReportService:
         except Exception as e:
             logging.error(f"LLM HTML conversion failed: {e}")
             # Fallback to local Markdown conversion
-            return markdown_to_html_fallback(markdown_content)
+            return markdown_to_html(markdown_content)
 
     def generate_financial_report(self, analysis: DebtAnalysisResult) -> bytes:
         """
@@ -161,17 +209,51 @@ class PDFReportService:
         Returns:
             PDF content as bytes
         """
-        initial_state = ReportState(
-            analysis_data=analysis,
-            raw_analysis="",
-            markdown_content="",
-            styled_html="",
-            pdf_bytes=b""
-        )
+        # Dump the analysis once; the graph nodes and the cache key work on the plain dict
+        analysis_dict = analysis.model_dump()
+
+        # Reuse the report if this exact analysis was rendered recently
+        cache_key = analysis_cache_key(analysis_dict)
+        cached_pdf = get_cached_report(cache_key)
+        if cached_pdf is not None:
+            return cached_pdf
+
+        initial_state = self._initial_state(analysis_dict)
         
         # Run the LangGraph workflow
-        final_state = self.graph.invoke(initial_state)
+        final_state = self.graph.invoke(initial_state, config=self._run_config())
+        
+        self._cache_final_report(cache_key, final_state)
+        return final_state["pdf_bytes"]
+
+    async def agenerate_financial_report(self, analysis: DebtAnalysisResult) -> bytes:
+        """
+        Async variant of generate_financial_report for use from the event loop.
+
+        The synchronous graph nodes (LLM calls and PDF rendering) run in worker
+        threads, so other requests keep being served while a report is generated.
         
+        Args:
+            analysis: The debt analysis result data
+            
+        Returns:
+            PDF content as bytes
+        """
+        # Dump the analysis once; the graph nodes and the cache key work on the plain dict
+        analysis_dict = analysis.model_dump()
+
+        # Reuse the report if this exact analysis was rendered recently
+        cache_key = analysis_cache_key(analysis_dict)
+        cached_pdf = get_cached_report(cache_key)
+        if cached_pdf is not None:
+            return cached_pdf
+
+        initial_state = self._initial_state(analysis_dict)
+
+        async with _report_semaphore:
+            final_state = await self.graph.ainvoke(initial_state, config=self._run_config())
+
+        self._cache_final_report(cache_key, final_state)
         return final_state["pdf_bytes"]
 
     def generate_simple_report(self, analysis: DebtAnalysisResult, filename: Optional[str] = None) -> str:
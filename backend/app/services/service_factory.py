@@ -1,3 +1,4 @@
+from functools import lru_cache
 from fastapi import Depends
 
 from ..db.database import MockDatabase, get_db
@@ -8,7 +9,7 @@ from .payment_service import PaymentService
 from .credit_score_service import CreditScoreService
 from .cashflow_service import CashflowService
 from .analysis_service import AnalysisService
-from .azure_ai_service import AzureAIService
+from .azure_ai_service import AzureAIService, get_azure_ai_service
 from .pdf_report_service import PDFReportService
 
 
@@ -42,14 +43,11 @@ def get_cashflow_service(db: MockDatabase = Depends(get_db)) -> CashflowService:
     """Get cashflow service instance via dependency injection"""
     return CashflowService(db)
 
-def get_azure_ai_service() -> AzureAIService:
-    """Get Azure AI service instance via dependency injection"""
-    return AzureAIService()
-
 def get_analysis_service(db: MockDatabase = Depends(get_db), azure_ai_service: AzureAIService = Depends(get_azure_ai_service)) -> AnalysisService:
     """Get analysis service instance via dependency injection"""
     return AnalysisService(db, azure_ai_service)
 
+@lru_cache(maxsize=1)
 def get_pdf_report_service() -> PDFReportService:
-    """Get PDF report service instance via dependency injection"""
+    """Get the shared PDF report service instance via dependency injection (it holds no per-request state)"""
     return PDFReportService()
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""
+Shared test configuration
+"""
+import os
+
+# Settings require the Azure AI configuration; the customer endpoints never call the model
+for name in ("AZURE_INFERENCE_ENDPOINT", "AZURE_INFERENCE_CREDENTIAL", "AZURE_INFERENCE_MODEL"):
+    os.environ.setdefault(name, "test")
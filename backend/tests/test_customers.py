@@ -0,0 +1,49 @@
+"""
+Tests for the customer endpoints
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.db.database import get_database
+from app.services.customer_service import CustomerService
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def customer_id() -> str:
+    return client.get(f"{settings.API_V1_STR}/customers").json()["data"][0]
+
+
+def test_customer_bundle_matches_profile_and_summary(customer_id):
+    base = f"{settings.API_V1_STR}/customers/{customer_id}"
+
+    response = client.get(f"{base}/bundle")
+
+    assert response.status_code == 200
+    bundle = response.json()["data"]
+    assert bundle["profile"] == client.get(f"{base}/profile").json()["data"]
+    assert bundle["summary"] == client.get(f"{base}/summary").json()["data"]
+
+
+def test_customer_bundle_unknown_customer():
+    response = client.get(f"{settings.API_V1_STR}/customers/UNKNOWN/bundle")
+
+    assert response.status_code == 404
+
+
+def test_customer_bundle_reads_customer_data_once(customer_id, monkeypatch):
+    db = get_database()
+    calls = []
+    get_customer_data = db.get_customer_data
+
+    def counting_get_customer_data(cid):
+        calls.append(cid)
+        return get_customer_data(cid)
+
+    monkeypatch.setattr(db, "get_customer_data", counting_get_customer_data)
+
+    assert CustomerService(db).get_customer_bundle(customer_id) is not None
+    assert calls == [customer_id]
@@ -1,14 +1,23 @@
+import importlib
+import time
 import streamlit as st
 
-from src.config.settings import PAGE_CONFIG
-from src.utils.api_client import check_api_health, load_customers, load_customer_profile, load_customer_summary
-from src.utils.ui_helpers import get_custom_css, show_error_message, show_success_message
-from src.pages.customer_dashboard import show_customer_dashboard
-from src.pages.debt_analysis import show_debt_analysis
-from src.pages.payment_simulations import show_payment_simulations
-from src.pages.consolidation_analysis import show_consolidation_analysis
-from src.pages.pdf_reports import show_pdf_reports
-from src.pages.data_management import show_data_management
+from src.config.settings import PAGE_CONFIG, HEALTH_CHECK_INTERVAL_SECONDS
+from src.utils.api_client import (
+    APIError, call_api, check_api_health, load_customers, fetch_customer_bundle
+)
+from src.utils.ui_helpers import get_custom_css, show_error_message
+
+# Page name -> (module, render function). Page modules are imported when first
+# opened, so e.g. the charting libraries only load once a page needs them.
+PAGES = {
+    "Customer Dashboard": ("src.pages.customer_dashboard", "show_customer_dashboard"),
+    "Debt Analysis": ("src.pages.debt_analysis", "show_debt_analysis"),
+    "Payment Simulations": ("src.pages.payment_simulations", "show_payment_simulations"),
+    "Consolidation Analysis": ("src.pages.consolidation_analysis", "show_consolidation_analysis"),
+    "PDF Reports": ("src.pages.pdf_reports", "show_pdf_reports"),
+    "Data Management": ("src.pages.data_management", "show_data_management")
+}
 
 
 def setup_page_config():
@@ -18,6 +27,8 @@ def setup_page_config():
 
 def apply_custom_styling():
     """Apply custom CSS styling"""
+    # Emitted on every full run, since Streamlit removes elements a rerun doesn't
+    # write again; page interactions rerun only their fragment and skip this
     st.markdown(get_custom_css(), unsafe_allow_html=True)
 
 
@@ -27,12 +38,36 @@ def render_header():
     st.markdown("---")
 
 
+def check_backend_health():
+    """Check the backend API at most every HEALTH_CHECK_INTERVAL_SECONDS per session and stop if it is unreachable"""
+    now = time.monotonic()
+    last_checked = st.session_state.get("backend_checked_at", 0.0)
+    if st.session_state.get("backend_ok") and now - last_checked < HEALTH_CHECK_INTERVAL_SECONDS:
+        return
+    
+    try:
+        backend_ok = check_api_health()
+    except APIError:
+        backend_ok = False
+    st.session_state["backend_ok"] = backend_ok
+    st.session_state["backend_checked_at"] = now
+    
+    if not backend_ok:
+        show_error_message("Backend API is not available. Please make sure the backend is running.")
+        st.stop()
+
+
 def render_sidebar():
     """Render sidebar navigation and customer selection"""
     st.sidebar.title("Navigation")
     
+    # Customer data is cached for a few minutes; this forces the next loads to hit the API
+    if st.sidebar.button("🔄 Refresh data", help="Reload customers and their data from the API"):
+        load_customers.clear()
+        fetch_customer_bundle.clear()
+    
     # Load customers
-    customers = load_customers()
+    customers = call_api(load_customers)
     if not customers:
         show_error_message("No customers found in the system")
         st.stop()
@@ -47,14 +82,7 @@ def render_sidebar():
     # Page selection
     page = st.sidebar.radio(
         "Select Page",
-        [
-            "Customer Dashboard",
-            "Debt Analysis",
-            "Payment Simulations", 
-            "Consolidation Analysis",
-            "PDF Reports",
-            "Data Management"
-        ]
+        list(PAGES)
     )
     
     return selected_customer, page
@@ -62,32 +90,28 @@ def render_sidebar():
 
 def load_customer_data(customer_id: str):
     """Load customer profile and summary data"""
-    customer_profile = load_customer_profile(customer_id)
-    customer_summary = load_customer_summary(customer_id)
-    
-    if not customer_profile or not customer_summary:
+    bundle = call_api(fetch_customer_bundle, customer_id)
+    if not bundle:
         show_error_message(f"Could not load data for customer {customer_id}")
         st.stop()
     
-    return customer_profile, customer_summary
+    return bundle["profile"], bundle["summary"]
 
 
 def route_to_page(page: str, customer_id: str, profile: dict, summary: dict):
     """Route to the selected page"""
-    page_functions = {
-        "Customer Dashboard": show_customer_dashboard,
-        "Debt Analysis": show_debt_analysis,
-        "Payment Simulations": show_payment_simulations,
-        "Consolidation Analysis": show_consolidation_analysis,
-        "PDF Reports": show_pdf_reports,
-        "Data Management": show_data_management
-    }
-    
-    page_function = page_functions.get(page)
-    if page_function:
-        page_function(customer_id, profile, summary)
-    else:
+    page_entry = PAGES.get(page)
+    if not page_entry:
         st.error(f"Unknown page: {page}")
+        return
+    
+    # import_module returns the already-loaded module from sys.modules after the first visit
+    module_name, function_name = page_entry
+    page_function = getattr(importlib.import_module(module_name), function_name)
+    
+    # Pages are st.fragment renderers: their widgets rerun only the page,
+    # not the health check, sidebar and customer data loading above it
+    page_function(customer_id, profile, summary)
 
 
 def main():
@@ -99,6 +123,9 @@ def main():
     # Header
     render_header()
     
+    # Backend availability
+    check_backend_health()
+    
     # Sidebar navigation
     selected_customer, selected_page = render_sidebar()
     
@@ -2,52 +2,34 @@
 Common UI components
 """
 import streamlit as st
+import pandas as pd
 from typing import Dict, List, Any
 from src.utils.ui_helpers import (
     format_currency, format_percentage, get_risk_indicator,
-    create_four_column_layout, create_three_column_layout, create_two_column_layout,
-    safe_numeric_parse
+    create_three_column_layout, create_two_column_layout,
+    safe_numeric_parse, display_paginated_dataframe, render_metric_row, ParsedSummary
 )
 
+# Portfolio table columns
+LOAN_COLS = ["loan_id", "product_type", "principal", "annual_rate_pct", "days_past_due"]
+CARD_COLS = ["card_id", "balance", "annual_rate_pct", "days_past_due"]
 
-def render_financial_metrics(summary: Dict):
+
+def render_financial_metrics(summary: ParsedSummary):
     """Render financial health overview metrics"""
     st.subheader("📊 Financial Health Overview")
     
-    col1, col2, col3, col4 = create_four_column_layout()
-    
-    with col1:
-        debt_amount = safe_numeric_parse(summary.get("total_debt", 0))
-        st.metric(
-            label="Total Debt",
-            value=format_currency(debt_amount)
-        )
-    
-    with col2:
-        monthly_payments = safe_numeric_parse(summary.get("total_monthly_payments", 0))
-        st.metric(
-            label="Monthly Payments",
-            value=format_currency(monthly_payments)
-        )
-    
-    with col3:
-        credit_score = safe_numeric_parse(summary.get("current_credit_score", 0))
-        st.metric(
-            label="Credit Score",
-            value=f"{credit_score:.0f}"
-        )
-    
-    with col4:
-        health_score = safe_numeric_parse(summary.get("financial_health_score", 0))
-        st.metric(
-            label="Health Score",
-            value=f"{health_score:.0f}/100"
-        )
+    render_metric_row([
+        ("Total Debt", format_currency(summary.total_debt), None),
+        ("Monthly Payments", format_currency(summary.total_monthly_payments), None),
+        ("Credit Score", f"{summary.current_credit_score:.0f}", None),
+        ("Health Score", f"{summary.financial_health_score:.0f}/100", None),
+    ])
 
 
-def render_risk_assessment(summary: Dict):
+def render_risk_assessment(summary: ParsedSummary):
     """Render risk level assessment"""
-    risk_level = summary.get("risk_level", "unknown")
+    risk_level = summary.risk_level
     risk_color = get_risk_indicator(risk_level)
     st.markdown(f"**Risk Level:** {risk_color} {risk_level.title()}")
 
@@ -62,9 +44,9 @@ def render_portfolio_overview(profile: Dict):
         st.write("**Loans**")
         loans = profile.get("loans", [])
         if loans:
-            import pandas as pd
-            loan_df = pd.DataFrame(loans)
-            st.dataframe(loan_df[["loan_id", "product_type", "principal", "annual_rate_pct", "days_past_due"]])
+            # Build only the displayed columns instead of projecting a full frame
+            loan_df = pd.DataFrame({col: [loan.get(col) for loan in loans] for col in LOAN_COLS})
+            display_paginated_dataframe(loan_df, key="loans_page")
         else:
             st.info("No loans found")
     
@@ -72,9 +54,8 @@ def render_portfolio_overview(profile: Dict):
         st.write("**Credit Cards**")
         cards = profile.get("cards", [])
         if cards:
-            import pandas as pd
-            card_df = pd.DataFrame(cards)
-            st.dataframe(card_df[["card_id", "balance", "annual_rate_pct", "days_past_due"]])
+            card_df = pd.DataFrame({col: [card.get(col) for card in cards] for col in CARD_COLS})
+            display_paginated_dataframe(card_df, key="cards_page")
         else:
             st.info("No credit cards found")
 
@@ -100,16 +81,15 @@ def render_cashflow_analysis(cashflow: Dict):
         st.metric("Income Variability", format_percentage(variability))
 
 
-def render_debt_to_income_ratio(cashflow: Dict, monthly_payments: float):
+def render_debt_to_income_ratio(cashflow: Dict, summary: ParsedSummary):
     """Render debt-to-income ratio"""
     if not cashflow:
         return
     
     income = safe_numeric_parse(cashflow.get("monthly_income_avg", 0))
-    monthly_payments = safe_numeric_parse(monthly_payments, 0)
     
     if income > 0:
-        dti_ratio = (monthly_payments / income) * 100
+        dti_ratio = (summary.total_monthly_payments / income) * 100
         st.metric("Debt-to-Income Ratio", format_percentage(dti_ratio))
 
 
@@ -117,38 +97,28 @@ def render_analysis_results(analysis_result: Dict):
     """Render debt analysis results"""
     st.subheader("📈 Analysis Results")
     
-    # Key Metrics
-    col1, col2, col3 = create_three_column_layout()
+    min_strategy = analysis_result.get("minimum_payment_strategy", {})
+    opt_strategy = analysis_result.get("optimized_payment_strategy", {})
+    savings = analysis_result.get("savings_vs_minimum", {})
     
-    with col1:
-        min_strategy = analysis_result.get("minimum_payment_strategy", {})
-        months = safe_numeric_parse(min_strategy.get('months', 0))
-        interest = safe_numeric_parse(min_strategy.get('total_interest', 0))
-        st.metric(
+    # Key Metrics
+    render_metric_row([
+        (
             "Minimum Payments",
-            f"{months:.0f} months",
-            delta=f"${interest:,.0f} interest"
-        )
-    
-    with col2:
-        opt_strategy = analysis_result.get("optimized_payment_strategy", {})
-        months = safe_numeric_parse(opt_strategy.get('months', 0))
-        interest = safe_numeric_parse(opt_strategy.get('total_interest', 0))
-        st.metric(
-            "Optimized Payments", 
-            f"{months:.0f} months",
-            delta=f"${interest:,.0f} interest"
-        )
-    
-    with col3:
-        savings = analysis_result.get("savings_vs_minimum", {})
-        months_saved = safe_numeric_parse(savings.get('months_saved', 0))
-        interest_saved = safe_numeric_parse(savings.get('interest_saved', 0))
-        st.metric(
+            f"{safe_numeric_parse(min_strategy.get('months', 0)):.0f} months",
+            f"${safe_numeric_parse(min_strategy.get('total_interest', 0)):,.0f} interest"
+        ),
+        (
+            "Optimized Payments",
+            f"{safe_numeric_parse(opt_strategy.get('months', 0)):.0f} months",
+            f"${safe_numeric_parse(opt_strategy.get('total_interest', 0)):,.0f} interest"
+        ),
+        (
             "Optimized Savings",
-            f"{months_saved:.0f} months",
-            delta=f"${interest_saved:,.0f} saved"
-        )
+            f"{safe_numeric_parse(savings.get('months_saved', 0)):.0f} months",
+            f"${safe_numeric_parse(savings.get('interest_saved', 0)):,.0f} saved"
+        ),
+    ])
 
 
 def render_consolidation_results(analysis_result: Dict):
@@ -159,19 +129,12 @@ def render_consolidation_results(analysis_result: Dict):
     
     st.subheader("🏦 Consolidation Analysis")
     
-    col1, col2, col3, col4 = create_four_column_layout()
-    
-    with col1:
-        st.metric("Offer ID", consolidation.get("offer_id", "N/A"))
-    
-    with col2:
-        st.metric("New Rate", f"{consolidation.get('new_rate_pct', 0)}%")
-    
-    with col3:
-        st.metric("Term", f"{consolidation.get('months', 0)} months")
-    
-    with col4:
-        st.metric("Total Interest", format_currency(consolidation.get('total_interest', 0)))
+    render_metric_row([
+        ("Offer ID", consolidation.get("offer_id", "N/A"), None),
+        ("New Rate", f"{consolidation.get('new_rate_pct', 0)}%", None),
+        ("Term", f"{consolidation.get('months', 0)} months", None),
+        ("Total Interest", format_currency(consolidation.get('total_interest', 0)), None),
+    ])
 
 
 def render_consolidation_savings(analysis_result: Dict):
@@ -180,21 +143,25 @@ def render_consolidation_savings(analysis_result: Dict):
     if not cons_savings:
         return
     
-    st.write("**Consolidation Savings:**")
-    
     vs_min = cons_savings.get("vs_minimum", {})
     vs_opt = cons_savings.get("vs_optimized", {})
     
-    col1, col2 = create_two_column_layout()
-    
-    with col1:
-        st.info(f"**vs Minimum:** {format_currency(vs_min.get('interest_saved', 0))} saved, {vs_min.get('months_saved', 0)} months faster")
-    
-    with col2:
-        if vs_opt.get('interest_saved', 0) > 0:
-            st.success(f"**vs Optimized:** {format_currency(vs_opt.get('interest_saved', 0))} saved, {abs(vs_opt.get('months_saved', 0))} months difference")
-        else:
-            st.warning(f"**vs Optimized:** {format_currency(abs(vs_opt.get('interest_saved', 0)))} more interest, {abs(vs_opt.get('months_saved', 0))} months longer")
+    vs_min_text = f"{format_currency(vs_min.get('interest_saved', 0))} saved, {vs_min.get('months_saved', 0)} months faster"
+    if vs_opt.get('interest_saved', 0) > 0:
+        vs_opt_class = "success-metric"
+        vs_opt_text = f"{format_currency(vs_opt.get('interest_saved', 0))} saved, {abs(vs_opt.get('months_saved', 0))} months difference"
+    else:
+        vs_opt_class = "warning-metric"
+        vs_opt_text = f"{format_currency(abs(vs_opt.get('interest_saved', 0)))} more interest, {abs(vs_opt.get('months_saved', 0))} months longer"
+    
+    # One markdown element for the whole block instead of a write, columns and two alerts
+    st.markdown(f"""
+    <p><strong>Consolidation Savings:</strong></p>
+    <div class="metric-row">
+        <div class="metric-card info-metric"><strong>vs Minimum:</strong> {vs_min_text}</div>
+        <div class="metric-card {vs_opt_class}"><strong>vs Optimized:</strong> {vs_opt_text}</div>
+    </div>
+    """, unsafe_allow_html=True)
 
 
 def render_simulation_results(result: Dict, title: str):
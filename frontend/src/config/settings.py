@@ -1,8 +1,12 @@
 import os
+from types import MappingProxyType
 
 # API Configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000/api/v1")
 
+# How often a session re-checks backend health
+HEALTH_CHECK_INTERVAL_SECONDS = 30
+
 # Page Configuration
 PAGE_CONFIG = {
     "page_title": "Financial Restructuring Assistant",
@@ -12,11 +16,11 @@ PAGE_CONFIG = {
 }
 
 
-# Sample Consolidation Offers
-SAMPLE_CONSOLIDATION_OFFERS = [
+# Sample Consolidation Offers (read-only; convert with dict() before sending to the API)
+SAMPLE_CONSOLIDATION_OFFERS = tuple(MappingProxyType(offer) for offer in [
     {
         "offer_id": "OF-CONSO-24M",
-        "product_types_eligible": ["card", "personal"],
+        "product_types_eligible": ("card", "personal"),
         "max_consolidated_balance": 50000,
         "new_rate_pct": 19.9,
         "max_term_months": 24,
@@ -24,10 +28,10 @@ SAMPLE_CONSOLIDATION_OFFERS = [
     },
     {
         "offer_id": "OF-CONSO-36M",
-        "product_types_eligible": ["card", "personal", "micro"],
+        "product_types_eligible": ("card", "personal", "micro"),
         "max_consolidated_balance": 75000,
         "new_rate_pct": 17.5,
         "max_term_months": 36,
         "conditions": "Score > 650 y sin mora activa"
     }
-]
+])
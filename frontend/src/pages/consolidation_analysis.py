@@ -2,33 +2,38 @@
 Consolidation Analysis Page
 """
 import streamlit as st
+from html import escape
 from typing import Dict, List
 from src.config.settings import SAMPLE_CONSOLIDATION_OFFERS
-from src.utils.api_client import get_eligible_offers, perform_debt_analysis
+from src.utils.api_client import call_api, get_eligible_offers, perform_debt_analysis
 from src.utils.ui_helpers import (
     show_loading_spinner, show_success_message, show_warning_message,
     show_info_message, display_consolidation_offer, 
-    create_two_column_layout, create_three_column_layout, format_currency
+    create_two_column_layout, render_metric_row, format_currency
 )
 
 
-def display_sample_offers(offers: List[Dict]):
+def build_sample_offers_html(offers) -> str:
+    """Build the static HTML for the sample offers, one collapsible block per offer"""
+    return "".join(
+        f"<details><summary>Offer {escape(offer['offer_id'])} - {offer['new_rate_pct']}% APR</summary>"
+        f"<p><strong>Rate:</strong> {offer['new_rate_pct']}%<br>"
+        f"<strong>Max Term:</strong> {offer['max_term_months']} months<br>"
+        f"<strong>Max Balance:</strong> {format_currency(offer['max_consolidated_balance'])}<br>"
+        f"<strong>Products:</strong> {escape(', '.join(offer['product_types_eligible']))}</p>"
+        f"<p><strong>Conditions:</strong> {escape(offer['conditions'])}</p></details>"
+        for offer in offers
+    )
+
+
+# The sample offers never change, so their markup is built once at import
+SAMPLE_OFFERS_HTML = build_sample_offers_html(SAMPLE_CONSOLIDATION_OFFERS)
+
+
+def display_sample_offers():
     """Display sample consolidation offers"""
     st.write("**Available Consolidation Offers:**")
-    
-    for offer in offers:
-        with st.expander(f"Offer {offer['offer_id']} - {offer['new_rate_pct']}% APR"):
-            col1, col2 = create_two_column_layout()
-            
-            with col1:
-                st.write(f"**Rate:** {offer['new_rate_pct']}%")
-                st.write(f"**Max Term:** {offer['max_term_months']} months")
-            
-            with col2:
-                st.write(f"**Max Balance:** {format_currency(offer['max_consolidated_balance'])}")
-                st.write(f"**Products:** {', '.join(offer['product_types_eligible'])}")
-            
-            st.write(f"**Conditions:** {offer['conditions']}")
+    st.markdown(SAMPLE_OFFERS_HTML, unsafe_allow_html=True)
 
 
 def display_eligible_offers(eligible_offers: List[Dict]):
@@ -45,16 +50,11 @@ def display_consolidation_simulation(analysis_result: Dict):
     if not consolidation:
         return
     
-    col1, col2, col3 = create_three_column_layout()
-    
-    with col1:
-        st.metric("Payoff Time", f"{consolidation['months']} months")
-    
-    with col2:
-        st.metric("Total Interest", format_currency(consolidation['total_interest']))
-    
-    with col3:
-        st.metric("Consolidated Amount", format_currency(consolidation['consolidated_amount']))
+    render_metric_row([
+        ("Payoff Time", f"{consolidation['months']} months", None),
+        ("Total Interest", format_currency(consolidation['total_interest']), None),
+        ("Consolidated Amount", format_currency(consolidation['consolidated_amount']), None),
+    ])
     
     # Savings analysis
     cons_savings = analysis_result.get("consolidation_savings")
@@ -76,6 +76,7 @@ def display_consolidation_simulation(analysis_result: Dict):
                 st.warning(f"**vs Optimized Payments:**\n\n{format_currency(abs(vs_opt.get('interest_saved', 0)))} more interest\n\n{abs(vs_opt.get('months_saved', 0))} months longer")
 
 
+@st.fragment
 def show_consolidation_analysis(customer_id: str, profile: Dict, summary: Dict):
     """Consolidation Analysis Page"""
     
@@ -85,7 +86,7 @@ def show_consolidation_analysis(customer_id: str, profile: Dict, summary: Dict):
     st.subheader("Configure Consolidation Offers")
     
     # Display sample offers
-    display_sample_offers(SAMPLE_CONSOLIDATION_OFFERS)
+    display_sample_offers()
     
     # Credit Score Input
     current_score = summary.get("current_credit_score", 720)
@@ -94,45 +95,64 @@ def show_consolidation_analysis(customer_id: str, profile: Dict, summary: Dict):
         min_value=300,
         max_value=850,
         value=current_score,
-        help="Enter the most recent credit score for eligibility assessment"
+        help="Enter the most recent credit score for eligibility assessment",
+        key=f"credit_score_{customer_id}"
     )
     
+    # The last eligibility check is kept in the session so later reruns
+    # (e.g. selecting or simulating an offer) don't repeat the API call
+    eligibility_key = f"elig_{customer_id}"
+    
     # Eligibility Check
     if st.button("Check Offer Eligibility", type="primary"):
         with show_loading_spinner("Evaluating offer eligibility..."):
-            eligibility_result = get_eligible_offers(customer_id, SAMPLE_CONSOLIDATION_OFFERS, credit_score)
+            eligibility_result = call_api(get_eligible_offers, customer_id, credit_score)
         
         if eligibility_result:
+            st.session_state[eligibility_key] = {
+                "credit_score": credit_score,
+                "result": eligibility_result,
+                # Offer lookup for the simulation, built once per check
+                "offers_by_id": {offer["offer_id"]: offer for offer in eligibility_result.get("eligible_offers", [])}
+            }
             show_success_message("Eligibility check completed!")
-            
-            eligible_offers = eligibility_result.get("eligible_offers", [])
-            total_evaluated = eligibility_result.get("total_offers_evaluated", 0)
-            
-            show_info_message(f"Evaluated {total_evaluated} offers, {len(eligible_offers)} are eligible")
-            
-            if eligible_offers:
-                display_eligible_offers(eligible_offers)
-                
-                # Consolidation Simulation
-                st.subheader("🧮 Consolidation Simulation")
-                
-                selected_offer_id = st.selectbox(
-                    "Select offer to simulate",
-                    [offer["offer_id"] for offer in eligible_offers]
-                )
-                
-                if st.button("Simulate Consolidation"):
-                    selected_offer = next(offer for offer in eligible_offers if offer["offer_id"] == selected_offer_id)
-                    
-                    with show_loading_spinner("Simulating consolidation..."):
-                        analysis_result = perform_debt_analysis(customer_id, [selected_offer])
-                    
-                    if analysis_result and analysis_result.get("consolidation_option"):
-                        display_consolidation_simulation(analysis_result)
-            
-            else:
-                show_warning_message("No eligible offers found for your current credit profile")
-                show_info_message("Consider improving your credit score to access better consolidation options")
-        
         else:
+            st.session_state.pop(eligibility_key, None)
             show_warning_message("Failed to check eligibility. Please try again.")
+    
+    # Only reuse the stored check while it matches the entered credit score
+    eligibility = st.session_state.get(eligibility_key)
+    if not eligibility or eligibility["credit_score"] != credit_score:
+        return
+    
+    eligibility_result = eligibility["result"]
+    offers_by_id = eligibility["offers_by_id"]
+    eligible_offers = eligibility_result.get("eligible_offers", [])
+    total_evaluated = eligibility_result.get("total_offers_evaluated", 0)
+    
+    show_info_message(f"Evaluated {total_evaluated} offers, {len(eligible_offers)} are eligible")
+    
+    if eligible_offers:
+        display_eligible_offers(eligible_offers)
+        
+        # Consolidation Simulation
+        st.subheader("🧮 Consolidation Simulation")
+        
+        selected_offer_id = st.selectbox(
+            "Select offer to simulate",
+            list(offers_by_id),
+            key=f"offer_select_{customer_id}"
+        )
+        
+        if st.button("Simulate Consolidation"):
+            selected_offer = offers_by_id[selected_offer_id]
+            
+            with show_loading_spinner("Simulating consolidation..."):
+                analysis_result = call_api(perform_debt_analysis, customer_id, [selected_offer])
+            
+            if analysis_result and analysis_result.get("consolidation_option"):
+                display_consolidation_simulation(analysis_result)
+    
+    else:
+        show_warning_message("No eligible offers found for your current credit profile")
+        show_info_message("Consider improving your credit score to access better consolidation options")
@@ -2,26 +2,43 @@
 Customer Dashboard Page
 """
 import streamlit as st
-from typing import Dict, Any
+from typing import Dict, List, Any
 from src.components.ui_components import (
     render_financial_metrics, render_risk_assessment, 
     render_portfolio_overview, render_cashflow_analysis,
     render_debt_to_income_ratio
 )
 from src.utils.charts import create_loan_portfolio_chart, create_card_balance_chart
-from src.utils.ui_helpers import safe_numeric_parse
+from src.utils.ui_helpers import parse_summary
 
 
+@st.fragment
+def render_portfolio_charts(customer_id: str, loans: List[Dict], cards: List[Dict]):
+    """Render portfolio charts on demand, so the dashboard first paints without building them"""
+    if not st.toggle("📊 Show portfolio charts", key=f"portfolio_charts_{customer_id}"):
+        return
+    
+    if loans:
+        create_loan_portfolio_chart(loans)
+    
+    if cards:
+        create_card_balance_chart(cards)
+
+
+@st.fragment
 def show_customer_dashboard(customer_id: str, profile: Dict, summary: Dict):
     """Customer Dashboard Page"""
     
     st.header(f"Customer Dashboard - {customer_id}")
     
+    # Parse the summary figures once for every section below
+    parsed_summary = parse_summary(summary)
+    
     # Financial Health Overview
-    render_financial_metrics(summary)
+    render_financial_metrics(parsed_summary)
     
     # Risk Level
-    render_risk_assessment(summary)
+    render_risk_assessment(parsed_summary)
     
     # Portfolio Overview
     render_portfolio_overview(profile)
@@ -30,11 +47,8 @@ def show_customer_dashboard(customer_id: str, profile: Dict, summary: Dict):
     loans = profile.get("loans", [])
     cards = profile.get("cards", [])
     
-    if loans:
-        create_loan_portfolio_chart(loans)
-    
-    if cards:
-        create_card_balance_chart(cards)
+    if loans or cards:
+        render_portfolio_charts(customer_id, loans, cards)
     
     # Cashflow Information
     cashflow = profile.get("cashflow")
@@ -42,5 +56,4 @@ def show_customer_dashboard(customer_id: str, profile: Dict, summary: Dict):
         render_cashflow_analysis(cashflow)
         
         # Debt-to-Income Ratio
-        monthly_payments = safe_numeric_parse(summary.get("total_monthly_payments", 0))
-        render_debt_to_income_ratio(cashflow, monthly_payments)
+        render_debt_to_income_ratio(cashflow, parsed_summary)
@@ -1,119 +1,168 @@
 """
 Data Management Page
 """
+import hashlib
+import json
 import streamlit as st
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
 from src.utils.charts import (
-    create_loan_portfolio_chart, create_card_balance_chart,
-    create_payment_history_chart, create_credit_score_trend
+    create_loan_portfolio_chart_df, create_card_balance_chart_df,
+    create_payment_history_chart_df, create_credit_score_trend_df
 )
-from src.utils.ui_helpers import create_three_column_layout, format_currency, safe_numeric_parse, safe_int_parse
+from src.utils.ui_helpers import create_three_column_layout, format_currency, safe_numeric_column
 
 
-def normalize_loan_data(loans: List[Dict]) -> List[Dict]:
+# Numeric fields parsed by the normalize_* functions
+LOAN_FLOAT_COLUMNS = ['principal', 'balance', 'annual_rate_pct', 'monthly_payment']
+LOAN_INT_COLUMNS = ['days_past_due', 'term_months']
+CARD_FLOAT_COLUMNS = ['balance', 'credit_limit', 'annual_rate_pct', 'minimum_payment']
+CARD_INT_COLUMNS = ['days_past_due']
+
+# Display formats for the detailed tables, applied by the pandas Styler
+LOAN_DISPLAY_FORMATS = {
+    'principal': "${:,.2f}",
+    'balance': "${:,.2f}",
+    'monthly_payment': "${:,.2f}",
+    'annual_rate_pct': "{:.2f}%"
+}
+CARD_DISPLAY_FORMATS = {
+    'balance': "${:,.2f}",
+    'credit_limit': "${:,.2f}",
+    'minimum_payment': "${:,.2f}",
+    'annual_rate_pct': "{:.2f}%",
+    'utilization_pct': "{:.1f}%"
+}
+PAYMENT_DISPLAY_FORMATS = {
+    'amount': "${:,.2f}",
+    'date': lambda d: d.strftime('%Y-%m-%d')
+}
+CREDIT_SCORE_DISPLAY_FORMATS = {
+    'date': lambda d: d.strftime('%Y-%m-%d')
+}
+
+# Backend dates are ISO dates; unparsable ones fall back to the normalization default
+DATE_FORMAT = '%Y-%m-%d'
+DEFAULT_DATE = pd.Timestamp('2024-01-01')
+
+
+def parse_date_column(values: pd.Series) -> pd.Series:
+    """Parse an ISO date column, replacing only the unparsable values with DEFAULT_DATE"""
+    return pd.to_datetime(values, format=DATE_FORMAT, errors='coerce', cache=True).fillna(DEFAULT_DATE)
+
+
+def empty_normalized_frame(float_columns: Sequence[str], int_columns: Sequence[str] = (), other_columns: Sequence[str] = ()) -> pd.DataFrame:
+    """Empty DataFrame with the columns and dtypes a normalizer produces, for customers without records"""
+    return pd.DataFrame(
+        {column: pd.Series(dtype="float64") for column in float_columns}
+        | {column: pd.Series(dtype="int64") for column in int_columns}
+        | {column: pd.Series(dtype="object") for column in other_columns}
+    )
+
+
+def profile_version(profile: Dict) -> str:
+    """Content digest of a customer profile, used to key the normalized data caches"""
+    payload = json.dumps(profile, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+# The normalizers are cached per profile version; the leading underscore tells
+# st.cache_data not to hash the raw rows, since the version already identifies them
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def normalize_loan_data(_loans: List[Dict], version: str) -> pd.DataFrame:
     """Normalize loan data ensuring numeric fields are properly parsed"""
-    normalized_loans = []
+    if not _loans:
+        return empty_normalized_frame(LOAN_FLOAT_COLUMNS, LOAN_INT_COLUMNS)
     
-    for loan in loans:
-        normalized_loan = loan.copy()
-        
-        # Parse numeric fields
-        normalized_loan['principal'] = safe_numeric_parse(loan.get('principal', 0))
-        normalized_loan['balance'] = safe_numeric_parse(loan.get('balance', 0))
-        normalized_loan['annual_rate_pct'] = safe_numeric_parse(loan.get('annual_rate_pct', 0))
-        normalized_loan['monthly_payment'] = safe_numeric_parse(loan.get('monthly_payment', 0))
-        normalized_loan['days_past_due'] = safe_int_parse(loan.get('days_past_due', 0))
-        normalized_loan['term_months'] = safe_int_parse(loan.get('term_months', 0))
-        
-        normalized_loans.append(normalized_loan)
+    loan_df = pd.DataFrame(_loans)
+    
+    # Parse numeric fields column by column
+    for column in LOAN_FLOAT_COLUMNS:
+        loan_df[column] = safe_numeric_column(loan_df, column)
+    for column in LOAN_INT_COLUMNS:
+        loan_df[column] = safe_numeric_column(loan_df, column).astype("int64")
     
-    return normalized_loans
+    return loan_df
 
 
-def normalize_card_data(cards: List[Dict]) -> List[Dict]:
+@st.cache_data(max_entries=32, show_spinner=False)
+def normalize_card_data(_cards: List[Dict], version: str) -> pd.DataFrame:
     """Normalize card data ensuring numeric fields are properly parsed"""
-    normalized_cards = []
+    if not _cards:
+        return empty_normalized_frame(CARD_FLOAT_COLUMNS + ['utilization_pct'], CARD_INT_COLUMNS)
     
-    for card in cards:
-        normalized_card = card.copy()
-        
-        # Parse numeric fields
-        normalized_card['balance'] = safe_numeric_parse(card.get('balance', 0))
-        normalized_card['credit_limit'] = safe_numeric_parse(card.get('credit_limit', 0))
-        normalized_card['annual_rate_pct'] = safe_numeric_parse(card.get('annual_rate_pct', 0))
-        normalized_card['minimum_payment'] = safe_numeric_parse(card.get('minimum_payment', 0))
-        normalized_card['days_past_due'] = safe_int_parse(card.get('days_past_due', 0))
-        
-        # Calculate utilization if not present
-        if 'utilization_pct' not in normalized_card or normalized_card.get('utilization_pct') is None:
-            credit_limit = normalized_card['credit_limit']
-            balance = normalized_card['balance']
-            if credit_limit > 0:
-                normalized_card['utilization_pct'] = round((balance / credit_limit) * 100, 2)
-            else:
-                normalized_card['utilization_pct'] = 0.0
-        else:
-            normalized_card['utilization_pct'] = safe_numeric_parse(card.get('utilization_pct', 0))
-        
-        normalized_cards.append(normalized_card)
+    card_df = pd.DataFrame(_cards)
+    
+    # Parse numeric fields column by column
+    for column in CARD_FLOAT_COLUMNS:
+        card_df[column] = safe_numeric_column(card_df, column)
+    for column in CARD_INT_COLUMNS:
+        card_df[column] = safe_numeric_column(card_df, column).astype("int64")
     
-    return normalized_cards
+    # Calculate utilization where it is not present
+    credit_limit = card_df['credit_limit']
+    computed_utilization = pd.Series(
+        np.where(credit_limit > 0, (card_df['balance'] / credit_limit.where(credit_limit > 0) * 100).round(2), 0.0),
+        index=card_df.index
+    )
+    if 'utilization_pct' in card_df.columns:
+        has_utilization = card_df['utilization_pct'].notna()
+        card_df['utilization_pct'] = safe_numeric_column(card_df, 'utilization_pct').where(
+            has_utilization, computed_utilization)
+    else:
+        card_df['utilization_pct'] = computed_utilization
+    
+    return card_df
 
 
-def normalize_payment_data(payments: List[Dict]) -> List[Dict]:
+@st.cache_data(max_entries=32, show_spinner=False)
+def normalize_payment_data(_payments: List[Dict], version: str) -> pd.DataFrame:
     """Normalize payment data ensuring numeric fields are properly parsed"""
-    normalized_payments = []
+    if not _payments:
+        return empty_normalized_frame(['amount'], other_columns=['date'])
     
-    for payment in payments:
-        normalized_payment = payment.copy()
-        
-        # Parse numeric fields
-        normalized_payment['amount'] = safe_numeric_parse(payment.get('amount', 0))
-        
-        # Ensure date is in proper format
-        if 'date' not in normalized_payment:
-            normalized_payment['date'] = '2024-01-01'  # Default date
-        
-        normalized_payments.append(normalized_payment)
+    payment_df = pd.DataFrame(_payments)
+    
+    # Parse numeric fields
+    payment_df['amount'] = safe_numeric_column(payment_df, 'amount')
     
-    return normalized_payments
+    # Ensure date is in proper format
+    payment_df['date'] = payment_df['date'].fillna('2024-01-01') if 'date' in payment_df.columns else '2024-01-01'  # Default date
+    
+    return payment_df
 
 
-def normalize_credit_score_data(credit_scores: List[Dict]) -> List[Dict]:
+@st.cache_data(max_entries=32, show_spinner=False)
+def normalize_credit_score_data(_credit_scores: List[Dict], version: str) -> pd.DataFrame:
     """Normalize credit score data ensuring numeric fields are properly parsed"""
-    normalized_scores = []
+    if not _credit_scores:
+        return empty_normalized_frame([], ['credit_score'], ['date'])
     
-    for score in credit_scores:
-        normalized_score = score.copy()
-        
-        # Parse numeric fields
-        normalized_score['credit_score'] = safe_int_parse(score.get('credit_score', 600))
-        
-        # Ensure score is within valid range
-        if normalized_score['credit_score'] < 300:
-            normalized_score['credit_score'] = 300
-        elif normalized_score['credit_score'] > 850:
-            normalized_score['credit_score'] = 850
-        
-        # Ensure date is in proper format
-        if 'date' not in normalized_score:
-            normalized_score['date'] = '2024-01-01'  # Default date
-        
-        normalized_scores.append(normalized_score)
+    score_df = pd.DataFrame(_credit_scores)
+    
+    # Parse numeric fields, keeping scores within the valid range; records without
+    # a score default to 600, while unparsable ones fall back to 0 (clipped to 300)
+    if 'credit_score' in score_df.columns:
+        scores = safe_numeric_column(score_df, 'credit_score').where(score_df['credit_score'].notna(), 600)
+        score_df['credit_score'] = scores.astype("int64").clip(300, 850)
+    else:
+        score_df['credit_score'] = 600
     
-    return normalized_scores
+    # Ensure date is in proper format
+    score_df['date'] = score_df['date'].fillna('2024-01-01') if 'date' in score_df.columns else '2024-01-01'  # Default date
+    
+    return score_df
 
 
-def render_loan_portfolio_tab(loans):
+def render_loan_portfolio_tab(loans, version: str):
     """Render loan portfolio tab"""
     st.subheader("💼 Loan Portfolio")
     
     if loans:
         # Normalize loan data
-        normalized_loans = normalize_loan_data(loans)
-        loan_df = pd.DataFrame(normalized_loans)
+        loan_df = normalize_loan_data(loans, version)
         
         # Summary metrics
         col1, col2, col3 = create_three_column_layout()
@@ -127,38 +176,26 @@ def render_loan_portfolio_tab(loans):
             st.metric("Average Rate", f"{avg_rate:.2f}%")
         
         with col3:
-            overdue_loans = len(loan_df[loan_df["days_past_due"] > 0])
+            overdue_loans = int((loan_df["days_past_due"].to_numpy() > 0).sum())
             st.metric("Overdue Loans", overdue_loans)
         
-        # Format numeric columns for display
-        display_df = loan_df.copy()
-        if 'principal' in display_df.columns:
-            display_df['principal'] = display_df['principal'].apply(lambda x: f"${x:,.2f}")
-        if 'balance' in display_df.columns:
-            display_df['balance'] = display_df['balance'].apply(lambda x: f"${x:,.2f}")
-        if 'monthly_payment' in display_df.columns:
-            display_df['monthly_payment'] = display_df['monthly_payment'].apply(lambda x: f"${x:,.2f}")
-        if 'annual_rate_pct' in display_df.columns:
-            display_df['annual_rate_pct'] = display_df['annual_rate_pct'].apply(lambda x: f"{x:.2f}%")
-        
-        # Detailed table
-        st.dataframe(display_df, use_container_width=True)
+        # Detailed table, formatted at render time
+        st.dataframe(loan_df.style.format(LOAN_DISPLAY_FORMATS), use_container_width=True)
         
         # Visualization
-        create_loan_portfolio_chart(normalized_loans)
+        create_loan_portfolio_chart_df(loan_df)
     
     else:
         st.info("No loans found for this customer")
 
 
-def render_credit_cards_tab(cards):
+def render_credit_cards_tab(cards, version: str):
     """Render credit cards tab"""
     st.subheader("💳 Credit Card Portfolio")
     
     if cards:
         # Normalize card data
-        normalized_cards = normalize_card_data(cards)
-        card_df = pd.DataFrame(normalized_cards)
+        card_df = normalize_card_data(cards, version)
         
         # Summary metrics
         col1, col2, col3 = create_three_column_layout()
@@ -172,48 +209,29 @@ def render_credit_cards_tab(cards):
             st.metric("Average Rate", f"{avg_rate:.2f}%")
         
         with col3:
-            overdue_cards = len(card_df[card_df["days_past_due"] > 0])
+            overdue_cards = int((card_df["days_past_due"].to_numpy() > 0).sum())
             st.metric("Overdue Cards", overdue_cards)
         
-        # Format numeric columns for display
-        display_df = card_df.copy()
-        if 'balance' in display_df.columns:
-            display_df['balance'] = display_df['balance'].apply(lambda x: f"${x:,.2f}")
-        if 'credit_limit' in display_df.columns:
-            display_df['credit_limit'] = display_df['credit_limit'].apply(lambda x: f"${x:,.2f}")
-        if 'minimum_payment' in display_df.columns:
-            display_df['minimum_payment'] = display_df['minimum_payment'].apply(lambda x: f"${x:,.2f}")
-        if 'annual_rate_pct' in display_df.columns:
-            display_df['annual_rate_pct'] = display_df['annual_rate_pct'].apply(lambda x: f"{x:.2f}%")
-        if 'utilization_pct' in display_df.columns:
-            display_df['utilization_pct'] = display_df['utilization_pct'].apply(lambda x: f"{x:.1f}%")
-        
-        # Detailed table
-        st.dataframe(display_df, use_container_width=True)
+        # Detailed table, formatted at render time
+        st.dataframe(card_df.style.format(CARD_DISPLAY_FORMATS), use_container_width=True)
         
         # Visualization
-        create_card_balance_chart(normalized_cards)
+        create_card_balance_chart_df(card_df)
     
     else:
         st.info("No credit cards found for this customer")
 
 
-def render_payments_tab(payments):
+def render_payments_tab(payments, version: str):
     """Render payments tab"""
     st.subheader("💰 Payment History")
     
     if payments:
         # Normalize payment data
-        normalized_payments = normalize_payment_data(payments)
-        payment_df = pd.DataFrame(normalized_payments)
+        payment_df = normalize_payment_data(payments, version)
         
         # Convert date column
-        try:
-            payment_df["date"] = pd.to_datetime(payment_df["date"])
-        except Exception as e:
-            st.warning(f"Date parsing issue: {e}")
-            # Create a default date column if parsing fails
-            payment_df["date"] = pd.to_datetime('2024-01-01')
+        payment_df["date"] = parse_date_column(payment_df["date"])
         
         # Summary metrics
         col1, col2, col3 = create_three_column_layout()
@@ -230,93 +248,82 @@ def render_payments_tab(payments):
             payment_count = len(payment_df)
             st.metric("Payment Count", payment_count)
         
-        # Format for display
-        display_df = payment_df.copy()
-        if 'amount' in display_df.columns:
-            display_df['amount'] = display_df['amount'].apply(lambda x: f"${x:,.2f}")
-        if 'date' in display_df.columns:
-            display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d')
-        
-        # Detailed table
-        st.dataframe(display_df, use_container_width=True)
+        # Detailed table, formatted at render time
+        st.dataframe(payment_df.style.format(PAYMENT_DISPLAY_FORMATS), use_container_width=True)
         
         # Payment timeline
-        create_payment_history_chart(normalized_payments)
+        create_payment_history_chart_df(payment_df)
     
     else:
         st.info("No payment history found for this customer")
 
 
-def render_credit_scores_tab(credit_scores):
+def render_credit_scores_tab(credit_scores, version: str):
     """Render credit scores tab"""
     st.subheader("📈 Credit Score History")
     
     if credit_scores:
         # Normalize credit score data
-        normalized_scores = normalize_credit_score_data(credit_scores)
-        score_df = pd.DataFrame(normalized_scores)
+        score_df = normalize_credit_score_data(credit_scores, version)
         
         # Convert date column
-        try:
-            score_df["date"] = pd.to_datetime(score_df["date"])
-        except Exception as e:
-            st.warning(f"Date parsing issue: {e}")
-            # Create a default date column if parsing fails
-            score_df["date"] = pd.to_datetime('2024-01-01')
+        score_df["date"] = parse_date_column(score_df["date"])
+        
+        # Sort once so the latest scores sit at the end, for the metrics and the trend chart
+        score_df = score_df.sort_values("date", ignore_index=True)
+        scores = score_df["credit_score"]
         
         # Summary metrics
         col1, col2, col3 = create_three_column_layout()
         
         with col1:
-            current_score = score_df.loc[score_df["date"].idxmax(), "credit_score"]
+            current_score = scores.iat[-1]
             st.metric("Current Score", current_score)
         
         with col2:
-            avg_score = score_df["credit_score"].mean()
+            avg_score = scores.mean()
             st.metric("Average Score", f"{avg_score:.0f}")
         
         with col3:
-            score_change = score_df["credit_score"].diff().iloc[-1] if len(score_df) > 1 else 0
+            score_change = scores.iat[-1] - scores.iat[-2] if len(score_df) > 1 else 0
             st.metric("Recent Change", f"{score_change:+.0f}")
         
-        # Format for display
-        display_df = score_df.copy()
-        if 'date' in display_df.columns:
-            display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d')
-        
-        # Detailed table
-        st.dataframe(display_df, use_container_width=True)
+        # Detailed table, formatted at render time
+        st.dataframe(score_df.style.format(CREDIT_SCORE_DISPLAY_FORMATS), use_container_width=True)
         
         # Score trend
-        create_credit_score_trend(normalized_scores)
+        create_credit_score_trend_df(score_df)
     
     else:
         st.info("No credit score history found for this customer")
 
 
+# Data management sections: profile field and tab renderer
+DATA_SECTIONS = {
+    "Loans": ("loans", render_loan_portfolio_tab),
+    "Credit Cards": ("cards", render_credit_cards_tab),
+    "Payments": ("payments_history", render_payments_tab),
+    "Credit Scores": ("credit_scores", render_credit_scores_tab),
+}
+
+
+@st.fragment
 def show_data_management(customer_id: str, profile: Dict, summary: Dict):
     """Data Management Page"""
     
     st.header(f"📊 Data Management - {customer_id}")
     
-    tab1, tab2, tab3, tab4 = st.tabs(["Loans", "Credit Cards", "Payments", "Credit Scores"])
-    
-    # Loans Tab
-    with tab1:
-        loans = profile.get("loans", [])
-        render_loan_portfolio_tab(loans)
-    
-    # Credit Cards Tab
-    with tab2:
-        cards = profile.get("cards", [])
-        render_credit_cards_tab(cards)
+    # Identifies this profile's data for the normalization caches
+    version = profile_version(profile)
     
-    # Payments Tab
-    with tab3:
-        payments = profile.get("payments_history", [])
-        render_payments_tab(payments)
+    # Only the selected section is built; st.tabs would run every tab's tables and charts on each rerun
+    section = st.segmented_control(
+        "Section",
+        list(DATA_SECTIONS),
+        default="Loans",
+        key="dm_active_tab",
+        label_visibility="collapsed"
+    ) or "Loans"
     
-    # Credit Scores Tab  
-    with tab4:
-        credit_scores = profile.get("credit_scores", [])
-        render_credit_scores_tab(credit_scores)
+    profile_key, render_section = DATA_SECTIONS[section]
+    render_section(profile.get(profile_key, []), version)
@@ -3,12 +3,13 @@ Payment Simulations Page
 """
 import streamlit as st
 from typing import Dict
-from src.utils.api_client import simulate_payments
+from src.utils.api_client import call_api, simulate_payments
 from src.components.ui_components import render_simulation_results
 from src.utils.charts import create_simple_payment_timeline
 from src.utils.ui_helpers import show_loading_spinner, format_currency
 
 
+@st.fragment
 def show_payment_simulations(customer_id: str, profile: Dict, summary: Dict):
     """Payment Simulations Page"""
     
@@ -22,7 +23,7 @@ def show_payment_simulations(customer_id: str, profile: Dict, summary: Dict):
         
         if st.button("Simulate Minimum Payments", key="min_sim"):
             with show_loading_spinner("Simulating minimum payment strategy..."):
-                min_result = simulate_payments(customer_id, "minimum")
+                min_result = call_api(simulate_payments, customer_id, "minimum")
             
             render_simulation_results(min_result, "Minimum Payments")
             
@@ -42,7 +43,7 @@ def show_payment_simulations(customer_id: str, profile: Dict, summary: Dict):
         
         if st.button("Simulate Optimized Payments", key="opt_sim"):
             with show_loading_spinner("Simulating optimized payment strategy..."):
-                opt_result = simulate_payments(customer_id, "optimized")
+                opt_result = call_api(simulate_payments, customer_id, "optimized")
             
             render_simulation_results(opt_result, "Optimized Payments")
             
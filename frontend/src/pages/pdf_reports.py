@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Dict, List
 from src.config.settings import SAMPLE_CONSOLIDATION_OFFERS
 from src.utils.api_client import (
+    call_api,
     generate_pdf_report, 
     download_pdf_report
 )
@@ -14,6 +15,10 @@ from src.utils.ui_helpers import (
     show_info_message, create_two_column_layout
 )
 
+# Offer lookup and selector labels, built once from the fixed sample offers
+_OFFERS_BY_ID = {offer["offer_id"]: offer for offer in SAMPLE_CONSOLIDATION_OFFERS}
+_OFFER_LABELS = [f"{offer['offer_id']} - {offer['new_rate_pct']}%" for offer in SAMPLE_CONSOLIDATION_OFFERS]
+
 
 def render_report_configuration():
     """Render report configuration form"""
@@ -45,18 +50,12 @@ def render_consolidation_offers_selection():
     
     selected_offers = st.multiselect(
         "Select offers to include in report",
-        [f"{offer['offer_id']} - {offer['new_rate_pct']}%" for offer in SAMPLE_CONSOLIDATION_OFFERS],
-        default=[f"{offer['offer_id']} - {offer['new_rate_pct']}%" for offer in SAMPLE_CONSOLIDATION_OFFERS]
+        _OFFER_LABELS,
+        default=_OFFER_LABELS
     )
     
     # Filter selected offers
-    offers_for_report = []
-    for offer_str in selected_offers:
-        offer_id = offer_str.split(" - ")[0]
-        offer = next(o for o in SAMPLE_CONSOLIDATION_OFFERS if o["offer_id"] == offer_id)
-        offers_for_report.append(offer)
-    
-    return offers_for_report
+    return [dict(_OFFERS_BY_ID[offer_str.split(" - ", 1)[0]]) for offer_str in selected_offers]
 
 
 def render_report_generation_buttons(customer_id: str, offers_for_report: List[Dict], report_title: str):
@@ -68,7 +67,7 @@ def render_report_generation_buttons(customer_id: str, offers_for_report: List[D
     with col1:
         if st.button("📄 Generate PDF Report", type="primary"):
             with show_loading_spinner("Generating comprehensive financial report..."):
-                report_result = generate_pdf_report(customer_id, offers_for_report, report_title)
+                report_result = call_api(generate_pdf_report, customer_id, offers_for_report, report_title)
 
             if report_result:
                 if report_result.get("report_generated"):
@@ -89,7 +88,7 @@ def render_report_generation_buttons(customer_id: str, offers_for_report: List[D
                     if filename:
                         try:
                             with show_loading_spinner("Preparing download..."):
-                                pdf_content = download_pdf_report(customer_id, filename)
+                                pdf_content = call_api(download_pdf_report, customer_id, filename)
                             
                             if pdf_content:
                                 st.download_button(
@@ -153,6 +152,7 @@ def render_report_history():
     show_info_message("Historical report management would require additional database functionality to track generated reports")
 
 
+@st.fragment
 def show_pdf_reports(customer_id: str, profile: Dict, summary: Dict):
     """PDF Reports Page"""
     
@@ -3,139 +3,147 @@ API Client for backend communication
 """
 import requests
 import streamlit as st
-from typing import Dict, List, Optional, Any
-from src.config.settings import API_BASE_URL
-
-
-class APIClient:
-    """API Client for backend communication"""
-    
-    @staticmethod
-    def get(endpoint: str) -> Dict[str, Any]:
-        """Make GET request to API"""
-        try:
-            response = requests.get(f"{API_BASE_URL}{endpoint}")
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            st.error(f"API Error: {str(e)}")
-            return {}
-    
-    @staticmethod
-    def get_file(endpoint: str) -> bytes:
-        """Make GET request to download file"""
-        try:
-            response = requests.get(f"{API_BASE_URL}{endpoint}")
-            response.raise_for_status()
-            return response.content
-        except requests.exceptions.RequestException as e:
-            st.error(f"File Download Error: {str(e)}")
-            return b""
-    
-    @staticmethod
-    def post(endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Make POST request to API"""
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}{endpoint}",
-                json=data,
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            st.error(f"API Error: {str(e)}")
-            return {}
-    
-    @staticmethod
-    def post_file(endpoint: str, data: Dict[str, Any]) -> bytes:
-        """Make POST request to download file directly"""
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}{endpoint}",
-                json=data,
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            return response.content
-        except requests.exceptions.RequestException as e:
-            st.error(f"File Generation Error: {str(e)}")
-            return b""
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Any
+from src.config.settings import API_BASE_URL, SAMPLE_CONSOLIDATION_OFFERS
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Get the shared HTTP session, so connections to the API are kept alive and reused"""
+    session = requests.Session()
+    # Connection failures are retried for every request, since nothing reached the backend;
+    # read errors and throttling/gateway statuses only for idempotent ones, as POSTs may
+    # already have started generating a report
+    retries = Retry(
+        total=3, connect=3, read=3, status=2, backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504], raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class APIError(Exception):
+    """Raised when a backend API call fails or returns no data"""
+
+
+def call_api(func, *args):
+    """Call an API function, showing its error and returning None when it fails"""
+    # Cached functions raise instead of returning empty results, so failures are never cached
+    try:
+        return func(*args)
+    except APIError as e:
+        st.error(f"API Error: {str(e)}")
+        return None
 
 
-def check_api_health() -> bool:
-    """Check if API is available"""
+# Request helpers for the backend API, all sharing the pooled session
+def _get(endpoint: str) -> Dict[str, Any]:
+    """Make GET request to API"""
     try:
-        response = APIClient.get("/health")
-        return response.get("status") == "healthy"
-    except:
-        return False
+        response = get_http_session().get(f"{API_BASE_URL}{endpoint}")
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        raise APIError(str(e)) from e
 
 
-def load_customers() -> List[str]:
-    """Load list of customer IDs"""
-    response = APIClient.get("/customers")
-    if response and "data" in response:
-        return response["data"]
-    return []
+def _get_file(endpoint: str) -> bytes:
+    """Make GET request to download file"""
+    try:
+        response = get_http_session().get(f"{API_BASE_URL}{endpoint}")
+        response.raise_for_status()
+        return response.content
+    except requests.exceptions.RequestException as e:
+        raise APIError(f"File download failed: {str(e)}") from e
 
 
-def load_customer_profile(customer_id: str) -> Optional[Dict]:
-    """Load complete customer profile"""
-    response = APIClient.get(f"/customers/{customer_id}/profile")
+def _post(endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Make POST request to API"""
+    try:
+        response = get_http_session().post(
+            f"{API_BASE_URL}{endpoint}",
+            json=data
+        )
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        raise APIError(str(e)) from e
+
+
+def _data(response: Dict[str, Any], endpoint: str) -> Any:
+    """Get the data of an API response, raising if it has none"""
     if response and "data" in response:
         return response["data"]
-    return None
+    raise APIError(f"No data returned by {endpoint}")
 
 
-def load_customer_summary(customer_id: str) -> Optional[Dict]:
-    """Load customer summary"""
-    response = APIClient.get(f"/customers/{customer_id}/summary")
-    if response and "data" in response:
-        return response["data"]
-    return None
+@st.cache_data(ttl=30, show_spinner=False)
+def check_api_health() -> bool:
+    """Check if API is available, raising APIError when it is not"""
+    response = _get("/health")
+    if response.get("status") != "healthy":
+        raise APIError("Backend API is not healthy")
+    return True
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_customers() -> List[str]:
+    """Load list of customer IDs"""
+    return _data(_get("/customers"), "/customers")
 
 
-def perform_debt_analysis(customer_id: str, consolidation_offers: List[Dict] = None) -> Optional[Dict]:
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_customer_bundle(customer_id: str) -> Dict[str, Dict]:
+    """Load the customer data every page needs, profile and summary, in a single request"""
+    endpoint = f"/customers/{customer_id}/bundle"
+    data = _data(_get(endpoint), endpoint) or {}
+    if not data.get("profile") or not data.get("summary"):
+        raise APIError(f"Incomplete customer data for {customer_id}")
+    return {"profile": data["profile"], "summary": data["summary"]}
+
+
+# Keyed on the customer and the offers' content, so re-simulating an offer the user
+# already tried (e.g. after switching back to it) is served without a backend call
+@st.cache_data(ttl=1800, show_spinner=False, max_entries=64)
+def perform_debt_analysis(customer_id: str, consolidation_offers: List[Dict] = None) -> Dict:
     """Perform comprehensive debt analysis"""
     data = {
         "customer_id": customer_id,
         "consolidation_offers": consolidation_offers or [],
         "cure_dpd_first": True
     }
-    response = APIClient.post("/analysis/debt-analysis", data)
-    if response and "data" in response:
-        return response["data"]
-    return None
+    return _data(_post("/analysis/debt-analysis", data), "/analysis/debt-analysis")
 
 
-def simulate_payments(customer_id: str, strategy: str = "minimum") -> Optional[Dict]:
+@st.cache_data(ttl=300, show_spinner=False, max_entries=64)
+def simulate_payments(customer_id: str, strategy: str = "minimum") -> Dict:
     """Simulate payment strategies"""
     endpoint = f"/analysis/simulate-{strategy}-payments"
     data = {
         "customer_id": customer_id,
         "cure_dpd_first": True
     }
-    response = APIClient.post(endpoint, data)
-    if response and "data" in response:
-        return response["data"]
-    return None
+    return _data(_post(endpoint, data), endpoint)
 
 
-def get_eligible_offers(customer_id: str, offers: List[Dict], credit_score: int) -> Optional[Dict]:
-    """Get eligible consolidation offers"""
+@st.cache_data(ttl=600, show_spinner=False)
+def get_eligible_offers(customer_id: str, credit_score: int) -> Dict:
+    """Get the sample consolidation offers the customer is eligible for"""
     data = {
         "customer_id": customer_id,
-        "offers": offers,
+        "offers": [dict(offer) for offer in SAMPLE_CONSOLIDATION_OFFERS],
         "credit_score": credit_score
     }
-    response = APIClient.post("/analysis/eligible-offers", data)
-    if response and "data" in response:
-        return response["data"]
-    return None
+    return _data(_post("/analysis/eligible-offers", data), "/analysis/eligible-offers")
 
 
-def generate_pdf_report(customer_id: str, consolidation_offers: List[Dict] = None, report_title: str = "Report") -> Optional[Dict]:
+# Not cached: each call writes a new report file on the backend, and a cached response
+# shared across sessions could name a file that is already gone
+def generate_pdf_report(customer_id: str, consolidation_offers: List[Dict] = None, report_title: str = "Report") -> Dict:
     """Generate PDF report"""
     data = {
         "customer_id": customer_id,
@@ -143,22 +151,19 @@ def generate_pdf_report(customer_id: str, consolidation_offers: List[Dict] = Non
         "consolidation_offers": consolidation_offers or [],
         "report_title": report_title
     }
-    response = APIClient.post("/reports/generate-report", data)
+    response = _post("/reports/generate-report", data)
+    if not response.get("report_generated"):
+        raise APIError("Report was not generated")
     return response
 
 
+# Cached as a shared resource: the PDF bytes are immutable, so cache hits return the
+# same object instead of unpickling a fresh copy of the file on every rerun
+@st.cache_resource(ttl=300, show_spinner=False, max_entries=64)
 def download_pdf_report(customer_id: str, filename: str) -> bytes:
     """Download PDF report file"""
     endpoint = f"/reports/download-report/{customer_id}/{filename}"
-    return APIClient.get_file(endpoint)
-
-
-def generate_and_download_pdf_report(customer_id: str, consolidation_offers: List[Dict] = None, report_title: str = None) -> bytes:
-    """Generate and directly download PDF report"""
-    data = {
-        "customer_id": customer_id,
-        "include_consolidation": True,
-        "consolidation_offers": consolidation_offers or [],
-        "report_title": report_title or f"Financial Analysis Report - {customer_id}"
-    }
-    return APIClient.post_file("/reports/generate-and-download", data)
+    content = _get_file(endpoint)
+    if not content:
+        raise APIError(f"Report file {filename} is empty")
+    return content
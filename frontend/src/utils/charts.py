@@ -1,13 +1,43 @@
 """
 Chart and visualization utilities
 """
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import streamlit as st
 from typing import Dict, List, Any
-from src.utils.ui_helpers import safe_numeric_parse
+from src.utils.ui_helpers import safe_numeric_column, safe_numeric_parse
+
+
+def parse_chart_dates(dates: pd.Series) -> pd.Series:
+    """Parse ISO dates, giving only the unparsable ones a synthetic monthly sequence"""
+    try:
+        parsed = pd.to_datetime(dates, errors="coerce", format="ISO8601", cache=True)
+    except ValueError:
+        # Mixed UTC offsets can't share a column, so all dates get the synthetic sequence
+        return pd.Series(pd.date_range(start='2024-01-01', periods=len(dates), freq='ME'), index=dates.index)
+    missing = parsed.isna()
+    if missing.any():
+        # In the parsed dates' timezone, as timezone-aware and naive values can't be mixed
+        parsed[missing] = pd.date_range(
+            start='2024-01-01', periods=int(missing.sum()), freq='ME', tz=parsed.dt.tz)
+    return parsed
+
+
+def _column_or_default(df: pd.DataFrame, column: str, default: Any) -> pd.Series:
+    """A raw record column with missing values, or the whole column if absent, set to default"""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index)
+    return df[column].fillna(default)
+
+
+def sort_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Order rows by date with one stable reindex, skipping it when they already are"""
+    dates = df["date"]
+    if dates.is_monotonic_increasing:
+        return df
+    return df.iloc[np.argsort(dates.to_numpy(), kind="stable")]
 
 
 def create_payment_comparison_chart(analysis_result: Dict):
@@ -35,34 +65,20 @@ def create_payment_comparison_chart(analysis_result: Dict):
         months.append(safe_numeric_parse(consolidation.get("months", 0)))
         interests.append(safe_numeric_parse(consolidation.get("total_interest", 0)))
     
-    # Create comparison chart
-    fig = make_subplots(
-        rows=1, cols=2,
-        subplot_titles=["Payoff Timeline", "Total Interest"],
-        specs=[[{"type": "bar"}, {"type": "bar"}]]
-    )
-    
-    # Payoff timeline
-    fig.add_trace(
-        go.Bar(x=strategies, y=months, name="Months", marker_color=["red", "blue", "green"][:len(strategies)]),
-        row=1, col=1
-    )
-    
-    # Total interest
-    fig.add_trace(
-        go.Bar(x=strategies, y=interests, name="Interest", marker_color=["red", "blue", "green"][:len(strategies)]),
-        row=1, col=2
-    )
+    # Create comparison chart: both measures share the strategy axis, interest on a secondary y-axis
+    fig = go.Figure(data=[
+        go.Bar(name="Months", x=strategies, y=months, yaxis="y", offsetgroup=1),
+        go.Bar(name="Total Interest ($)", x=strategies, y=interests, yaxis="y2", offsetgroup=2)
+    ])
     
     fig.update_layout(
         title="Payment Strategy Comparison",
-        showlegend=False,
+        yaxis=dict(title="Months"),
+        yaxis2=dict(title="Total Interest ($)", overlaying="y", side="right"),
+        barmode="group",
         height=400
     )
     
-    fig.update_yaxes(title_text="Months", row=1, col=1)
-    fig.update_yaxes(title_text="Total Interest ($)", row=1, col=2)
-    
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -77,8 +93,8 @@ def create_simple_payment_timeline(summary: Dict):
         months = int(total_debt / monthly_payment)
         
         # Create timeline
-        timeline_months = list(range(1, min(months + 1, 61)))  # Cap at 60 months for display
-        remaining_balance = [max(0, total_debt - (month * monthly_payment)) for month in timeline_months]
+        timeline_months = np.arange(1, min(months + 1, 61))  # Cap at 60 months for display
+        remaining_balance = np.clip(total_debt - timeline_months * monthly_payment, 0.0, None)
         
         df = pd.DataFrame({
             "Month": timeline_months,
@@ -112,28 +128,23 @@ def create_loan_portfolio_chart(loans: List[Dict]):
     if not loans:
         return
     
-    # Normalize loan data for charting
-    normalized_loans = []
-    for loan in loans:
-        normalized_loan = {
-            'loan_id': loan.get('loan_id', 'Unknown'),
-            'principal': safe_numeric_parse(loan.get('principal', 0))
-        }
-        normalized_loans.append(normalized_loan)
-    
-    loan_df = pd.DataFrame(normalized_loans)
+    # Normalize loan data for charting, parsing each numeric column in one vectorized pass
+    raw_df = pd.DataFrame(loans)
+    loan_df = pd.DataFrame({
+        'loan_id': _column_or_default(raw_df, 'loan_id', 'Unknown'),
+        'principal': safe_numeric_column(raw_df, 'principal')
+    })
     
+    create_loan_portfolio_chart_df(loan_df)
+
+
+def create_loan_portfolio_chart_df(loan_df: pd.DataFrame):
+    """Create loan portfolio visualization from a normalized loan DataFrame"""
     # Filter out zero-value loans
     loan_df = loan_df[loan_df['principal'] > 0]
     
     if len(loan_df) > 1:
-        fig = px.pie(
-            loan_df, 
-            values="principal", 
-            names="loan_id",
-            title="Loan Portfolio Distribution"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_loan_portfolio_figure(loan_df), use_container_width=True)
     elif len(loan_df) == 1:
         st.info(f"Single loan: {loan_df.iloc[0]['loan_id']} - ${loan_df.iloc[0]['principal']:,.2f}")
 
@@ -144,112 +155,116 @@ def create_card_balance_chart(cards: List[Dict]):
         return
     
     # Normalize card data for charting
-    normalized_cards = []
-    for card in cards:
-        normalized_card = {
-            'card_id': card.get('card_id', 'Unknown'),
-            'balance': safe_numeric_parse(card.get('balance', 0)),
-            'annual_rate_pct': safe_numeric_parse(card.get('annual_rate_pct', 0))
-        }
-        normalized_cards.append(normalized_card)
-    
-    card_df = pd.DataFrame(normalized_cards)
+    raw_df = pd.DataFrame(cards)
+    card_df = pd.DataFrame({
+        'card_id': _column_or_default(raw_df, 'card_id', 'Unknown'),
+        'balance': safe_numeric_column(raw_df, 'balance'),
+        'annual_rate_pct': safe_numeric_column(raw_df, 'annual_rate_pct')
+    })
     
+    create_card_balance_chart_df(card_df)
+
+
+def create_card_balance_chart_df(card_df: pd.DataFrame):
+    """Create credit card balance visualization from a normalized card DataFrame"""
     # Filter out zero-balance cards
     card_df = card_df[card_df['balance'] > 0]
     
     if len(card_df) > 1:
-        fig = px.bar(
-            card_df,
-            x="card_id",
-            y="balance", 
-            color="annual_rate_pct",
-            title="Credit Card Balances by Rate",
-            labels={"balance": "Balance ($)", "annual_rate_pct": "Annual Rate (%)"}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_card_balance_figure(card_df), use_container_width=True)
     elif len(card_df) == 1:
         st.info(f"Single card: {card_df.iloc[0]['card_id']} - ${card_df.iloc[0]['balance']:,.2f} at {card_df.iloc[0]['annual_rate_pct']:.2f}%")
 
 
-def create_payment_history_chart(payments: List[Dict]):
-    """Create payment history timeline"""
-    if not payments:
-        return
-    
-    # Normalize payment data for charting
-    normalized_payments = []
-    for payment in payments:
-        normalized_payment = {
-            'date': payment.get('date', '2024-01-01'),
-            'amount': safe_numeric_parse(payment.get('amount', 0)),
-            'product_type': payment.get('product_type', 'Unknown')
-        }
-        normalized_payments.append(normalized_payment)
+def create_payment_history_chart_df(payment_df: pd.DataFrame):
+    """Create payment history timeline from a normalized payment DataFrame"""
+    # Parse dates safely; frames from the data management tab already hold datetimes
+    if not pd.api.types.is_datetime64_any_dtype(payment_df["date"]):
+        payment_df = payment_df.assign(date=parse_chart_dates(payment_df["date"]))
     
-    payment_df = pd.DataFrame(normalized_payments)
-    
-    # Parse dates safely
-    try:
-        payment_df["date"] = pd.to_datetime(payment_df["date"])
-    except Exception:
-        # If date parsing fails, create a sequence of dates
-        payment_df["date"] = pd.date_range(start='2024-01-01', periods=len(payment_df), freq='M')
+    # Only rebuild the product type column when values are missing
+    if "product_type" not in payment_df.columns:
+        payment_df = payment_df.assign(product_type='Unknown')
+    elif payment_df["product_type"].isna().any():
+        payment_df = payment_df.assign(product_type=payment_df["product_type"].fillna('Unknown'))
     
     # Filter out zero-amount payments
     payment_df = payment_df[payment_df['amount'] > 0]
     
     if len(payment_df) > 1:
-        fig = px.line(
-            payment_df.sort_values("date"),
-            x="date",
-            y="amount",
-            color="product_type",
-            title="Payment History Timeline",
-            labels={"amount": "Payment Amount ($)", "date": "Date"}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_payment_history_figure(payment_df), use_container_width=True)
     elif len(payment_df) == 1:
         st.info(f"Single payment: ${payment_df.iloc[0]['amount']:,.2f} on {payment_df.iloc[0]['date'].strftime('%Y-%m-%d')}")
 
 
-def create_credit_score_trend(credit_scores: List[Dict]):
-    """Create credit score trend chart"""
-    if not credit_scores:
-        return
-    
-    # Normalize credit score data for charting
-    normalized_scores = []
-    for score in credit_scores:
-        normalized_score = {
-            'date': score.get('date', '2024-01-01'),
-            'credit_score': max(300, min(850, safe_numeric_parse(score.get('credit_score', 600))))  # Clamp to valid range
-        }
-        normalized_scores.append(normalized_score)
-    
-    score_df = pd.DataFrame(normalized_scores)
-    
-    # Parse dates safely
-    try:
-        score_df["date"] = pd.to_datetime(score_df["date"])
-    except Exception:
-        # If date parsing fails, create a sequence of dates
-        score_df["date"] = pd.date_range(start='2024-01-01', periods=len(score_df), freq='M')
+def create_credit_score_trend_df(score_df: pd.DataFrame):
+    """Create credit score trend chart from a normalized credit score DataFrame"""
+    # Parse dates safely; frames from the data management tab already hold datetimes
+    if not pd.api.types.is_datetime64_any_dtype(score_df["date"]):
+        score_df = score_df.assign(date=parse_chart_dates(score_df["date"]))
     
     if len(score_df) > 1:
-        fig = px.line(
-            score_df.sort_values("date"),
-            x="date",
-            y="credit_score",
-            title="Credit Score Trend",
-            range_y=[300, 850],
-            labels={"credit_score": "Credit Score", "date": "Date"}
-        )
-        fig.add_hline(y=650, line_dash="dash", line_color="orange", annotation_text="Fair Credit")
-        fig.add_hline(y=700, line_dash="dash", line_color="green", annotation_text="Good Credit")
-        fig.add_hline(y=750, line_dash="dash", line_color="blue", annotation_text="Excellent Credit")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_credit_score_trend_figure(score_df), use_container_width=True)
     elif len(score_df) == 1:
         score = score_df.iloc[0]['credit_score']
         date = score_df.iloc[0]['date'].strftime('%Y-%m-%d')
         st.info(f"Single score record: {score} on {date}")
+
+
+# Figure builders for the portfolio charts. Figures are cached as shared resources keyed
+# on the chart data, so reruns with unchanged data skip rebuilding the Plotly object tree;
+# callers only pass them to st.plotly_chart and never modify them.
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_loan_portfolio_figure(loan_df: pd.DataFrame) -> go.Figure:
+    """Build the loan portfolio pie chart"""
+    return px.pie(
+        loan_df, 
+        values="principal", 
+        names="loan_id",
+        title="Loan Portfolio Distribution"
+    )
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_card_balance_figure(card_df: pd.DataFrame) -> go.Figure:
+    """Build the credit card balance bar chart"""
+    return px.bar(
+        card_df,
+        x="card_id",
+        y="balance", 
+        color="annual_rate_pct",
+        title="Credit Card Balances by Rate",
+        labels={"balance": "Balance ($)", "annual_rate_pct": "Annual Rate (%)"}
+    )
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_payment_history_figure(payment_df: pd.DataFrame) -> go.Figure:
+    """Build the payment history line chart"""
+    return px.line(
+        sort_by_date(payment_df),
+        x="date",
+        y="amount",
+        color="product_type",
+        title="Payment History Timeline",
+        labels={"amount": "Payment Amount ($)", "date": "Date"}
+    )
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_credit_score_trend_figure(score_df: pd.DataFrame) -> go.Figure:
+    """Build the credit score trend line chart with the credit tier thresholds"""
+    # The data management tab passes scores already sorted by date
+    fig = px.line(
+        sort_by_date(score_df),
+        x="date",
+        y="credit_score",
+        title="Credit Score Trend",
+        range_y=[300, 850],
+        labels={"credit_score": "Credit Score", "date": "Date"}
+    )
+    fig.add_hline(y=650, line_dash="dash", line_color="orange", annotation_text="Fair Credit")
+    fig.add_hline(y=700, line_dash="dash", line_color="green", annotation_text="Good Credit")
+    fig.add_hline(y=750, line_dash="dash", line_color="blue", annotation_text="Excellent Credit")
+    return fig
@@ -1,76 +1,132 @@
 """
 UI Helper functions and components
 """
+import pandas as pd
 import streamlit as st
-from typing import Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+
+# Common currency symbols removed from numeric strings, e.g. "$1,250.00"
+_NUMERIC_STRIP_TABLE = str.maketrans('', '', '$,')
+_MISSING_NUMERIC_STRINGS = frozenset({'', 'n/a', 'na', 'null', 'none'})
+
+
+@lru_cache(maxsize=4096)
+def _parse_numeric_str(value: str, default: float) -> float:
+    """Parse a numeric string, memoized since the same strings repeat across records"""
+    cleaned = value.translate(_NUMERIC_STRIP_TABLE).strip()
+    if cleaned.lower() in _MISSING_NUMERIC_STRINGS:
+        return default
+    try:
+        return float(cleaned)
+    except ValueError:
+        return default
 
 
 def safe_numeric_parse(value: Any, default: float = 0.0) -> float:
     """Safely parse a value to float"""
+    # Most values come from the API as JSON numbers, so check those first
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    
     if value is None:
         return default
     
+    # Handle string representations
+    if isinstance(value, str):
+        return _parse_numeric_str(value, default)
+    
+    # Handle other types
     try:
-        # Handle string representations
-        if isinstance(value, str):
-            # Remove common currency symbols and whitespace
-            cleaned = value.replace('$', '').replace(',', '').strip()
-            if cleaned == '' or cleaned.lower() in ['n/a', 'na', 'null', 'none']:
-                return default
-            return float(cleaned)
-        
-        # Handle numeric types
-        elif isinstance(value, (int, float)):
-            return float(value)
-        
-        # Handle other types
-        else:
-            return float(value)
-            
+        return float(value)
     except (ValueError, TypeError):
         return default
 
 
-def safe_int_parse(value: Any, default: int = 0) -> int:
-    """Safely parse a value to int"""
-    try:
-        parsed_float = safe_numeric_parse(value, default)
-        return int(parsed_float)
-    except (ValueError, TypeError):
-        return default
+def safe_numeric_column(df: pd.DataFrame, column: str, default: float = 0.0) -> pd.Series:
+    """Vectorized safe_numeric_parse over a DataFrame column; a missing column is all default"""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype="float64")
+    
+    values = df[column]
+    if not pd.api.types.is_numeric_dtype(values):
+        # Remove common currency symbols and whitespace, as safe_numeric_parse does
+        values = values.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(values, errors="coerce").fillna(default).astype("float64")
+
+
+@dataclass(slots=True)
+class ParsedSummary:
+    """Customer summary with its figures parsed to numbers once per page render"""
+    total_debt: float
+    total_monthly_payments: float
+    current_credit_score: float
+    financial_health_score: float
+    risk_level: str
+
+
+def parse_summary(summary: Dict[str, Any]) -> ParsedSummary:
+    """Parse the numeric fields of a customer summary"""
+    return ParsedSummary(
+        total_debt=safe_numeric_parse(summary.get("total_debt", 0)),
+        total_monthly_payments=safe_numeric_parse(summary.get("total_monthly_payments", 0)),
+        current_credit_score=safe_numeric_parse(summary.get("current_credit_score", 0)),
+        financial_health_score=safe_numeric_parse(summary.get("financial_health_score", 0)),
+        risk_level=summary.get("risk_level", "unknown")
+    )
+
+
+RISK_INDICATORS = {
+    "low": "🟢",
+    "medium": "🟡", 
+    "high": "🔴"
+}
 
 
 def get_risk_indicator(risk_level: str) -> str:
     """Get risk level indicator emoji"""
-    risk_indicators = {
-        "low": "🟢",
-        "medium": "🟡", 
-        "high": "🔴"
-    }
-    return risk_indicators.get(risk_level.lower(), "⚪")
+    # The backend sends lowercase levels, so only other casings need lowering
+    indicator = RISK_INDICATORS.get(risk_level)
+    if indicator is not None:
+        return indicator
+    return RISK_INDICATORS.get(risk_level.lower(), "⚪")
+
+
+# Bound format methods, looked up once instead of on every call
+_format_currency = "${:,.2f}".format
+_format_percentage = "{:.1f}%".format
 
 
 def format_currency(amount: float | str) -> str:
     """Format amount as currency"""
-    if isinstance(amount, float):
-        return f"${amount:,.2f}"
-    return f"${float(amount):,.2f}"
+    if isinstance(amount, str):
+        amount = float(amount)
+    return _format_currency(amount)
 
 
 def format_percentage(percentage: float) -> str:
     """Format number as percentage"""
-    return f"{percentage:.1f}%"
+    return _format_percentage(percentage)
+
+
+# CSS classes for each metric card type, defined in CUSTOM_CSS
+METRIC_CARD_CLASSES = {
+    "normal": "metric-card",
+    "success": "metric-card success-metric",
+    "warning": "metric-card warning-metric", 
+    "danger": "metric-card danger-metric",
+    "info": "metric-card info-metric"
+}
 
 
 def display_metric_card(title: str, value: str, delta: str = None, card_type: str = "normal"):
     """Display a styled metric card"""
-    css_class = {
-        "normal": "metric-card",
-        "success": "metric-card success-metric",
-        "warning": "metric-card warning-metric", 
-        "danger": "metric-card danger-metric",
-        "info": "metric-card info-metric"
-    }.get(card_type, "metric-card")
+    css_class = METRIC_CARD_CLASSES.get(card_type, "metric-card")
     
     st.markdown(f"""
     <div class="{css_class}">
@@ -121,6 +177,13 @@ def create_four_column_layout():
     return st.columns(4)
 
 
+def render_metric_row(specs: Sequence[Tuple[str, Any, Optional[str]]]):
+    """Render a row of metrics, one column per (label, value, delta) spec"""
+    columns = st.columns(len(specs))
+    for column, (label, value, delta) in zip(columns, specs):
+        column.metric(label=label, value=value, delta=delta)
+
+
 def display_data_table(data, title: str = None):
     """Display data as formatted table"""
     if title:
@@ -132,6 +195,25 @@ def display_data_table(data, title: str = None):
         st.info("No data available")
 
 
+def display_paginated_dataframe(df, key: str, page_size: int = 20):
+    """Display a DataFrame one page at a time, so large tables aren't sent to the browser in full"""
+    if len(df) <= page_size:
+        st.dataframe(df)
+        return
+    
+    num_pages = (len(df) - 1) // page_size + 1
+    page = st.number_input(
+        f"Page (1-{num_pages})",
+        min_value=1,
+        max_value=num_pages,
+        value=1,
+        key=key
+    )
+    start = (page - 1) * page_size
+    st.dataframe(df.iloc[start:start + page_size])
+    st.caption(f"Rows {start + 1}-{min(start + page_size, len(df))} of {len(df)}")
+
+
 def create_expandable_section(title: str, content_func, expanded: bool = False):
     """Create expandable section"""
     with st.expander(title, expanded=expanded):
@@ -193,9 +275,8 @@ def render_customer_header(customer_id: str, profile: Dict[str, Any]):
             st.metric("Monthly Income", "N/A")
 
 
-def get_custom_css() -> str:
-    """Get custom CSS styles"""
-    return """
+# Static stylesheet, built once at import
+CUSTOM_CSS = """
     <style>
         .metric-card {
             background-color: #f0f2f6;
@@ -219,6 +300,13 @@ def get_custom_css() -> str:
             background-color: #d1ecf1;
             border: 1px solid #bee5eb;
         }
+        .metric-row {
+            display: flex;
+            gap: 1rem;
+        }
+        .metric-row > .metric-card {
+            flex: 1;
+        }
         .stButton > button {
             width: 100%;
         }
@@ -231,3 +319,8 @@ def get_custom_css() -> str:
         }
     </style>
     """
+
+
+def get_custom_css() -> str:
+    """Get custom CSS styles"""
+    return CUSTOM_CSS
@@ -0,0 +1,18 @@
+"""
+Tests for the data management page normalization
+"""
+from src.pages.data_management import normalize_credit_score_data
+
+
+def test_normalize_credit_score_data_defaults_missing_score():
+    scores = [
+        {"date": "2024-01-01", "credit_score": 720},
+        {"date": "2024-02-01"},
+        {"date": "2024-03-01", "credit_score": "n/a"},
+        {"date": "2024-04-01", "credit_score": "900"},
+    ]
+
+    score_df = normalize_credit_score_data(scores, "test-missing-score")
+
+    # A record without a score gets 600, an unparsable one 0 clipped to 300
+    assert score_df["credit_score"].tolist() == [720, 600, 300, 850]